@@ -13,20 +13,21 @@
 
 
 import math
+
+from ln_tools import fast_ln
+
+# any positive x works: the engine splits x into mantissa and exponent before summing the series
 x = float(input("Enter a value for x: "))
-while((x <= 0 or x > 2)):
+while x <= 0:
     x = float(input("Out of range! Try again: "))
 tol = float(input("Enter the tolerance: "))
-val = x - 1          
-n = 2
-next = (((x-1) ** n) / n) * (-1, 1)[n%2]
-while (abs(next)>=tol):
-    #print(val)
-    val += next
-    n += 1
-    next = (((x-1) ** n) / n) * (-1, 1)[n%2]
+while tol <= 0:
+    tol = float(input("The tolerance must be positive! Try again: "))
+values, terms = fast_ln(x, tol)
+val = float(values)
 
 diff = abs(math.log(x) - val)
 print(f"ln({x}) is approximately {val}")
 print(f"ln({x}) is exactly {math.log(x)}")
 print(f"The difference is {diff}")
+print(f"Series terms used: {terms}")
@@ -11,43 +11,184 @@
 # Assignment: Lab 8.17
 # Date: 19 October 2025
 
-time = input("Enter the time: ")
-clock_type = int(input("Choose the clock type (12 or 24): "))
-preferred_char = (input("Enter your preferred character: "))
-
-#ensures that the preffered character is valid:
-while(not (preferred_char in "abcdeghkmnopqrsuvwxyz@$&*= ")):
-    preferred_char = (input("Character not permitted! Try again: "))
-    
-if(clock_type == 12): #reformats number from 24 hours to 12 hours if necesary
-    time = time + "AM" if(int(time[0:time.index(":")]) <= 12) else str(int(time[:time.index(":")])-12) + time[-3:] + "PM"
-    time = "12" + time[1:] if time[0] == "0" else time
+import mmap
+import sys
+import time as clock
+from datetime import datetime
+from functools import lru_cache
+
+PERMITTED_CHARS = "abcdeghkmnopqrsuvwxyz@$&*= "
+CLOCK_TYPES = (12, 24)
+
+# every clock character as five rows; "#" marks the cells drawn with the preferred character
+glyph_shapes = {
+    '1': [" # ", "## ", " # ", " # ", "###"], #1
+    '2': ["###", "  #", "###", "#  ", "###"], #2
+    '3': ["###", "  #", "###", "  #", "###"], #3
+    '4': ["# #", "# #", "###", "  #", "  #"], #4
+    '5': ["###", "#  ", "###", "  #", "###"], #5
+    '6': ["###", "#  ", "###", "# #", "###"], #6
+    '7': ["###", "  #", "  #", "  #", "  #"], #7
+    '8': ["###", "# #", "###", "# #", "###"], #8
+    '9': ["###", "# #", "###", "  #", "###"], #9
+    '0': ["###", "# #", "# #", "# #", "###"], #0
+
+    'A': [" A ", "A A", "AAA", "A A", "A A"], #A
+    'P': ["PPP", "P P", "PPP", "P  ", "P  "], #P
+    'M': ["M   M", "MM MM", "M M M", "M   M", "M   M"], #M
+    ':': [" ", ":", " ", ":", " "] #:
+}
+
+
+@lru_cache(maxsize=64)
+def glyph_atlas(c):
+    """ Builds every character's five rows for the preferred character c, once per c.
+        A blank c (or one of the clock's own characters) draws each digit with the digit itself. """
+
+    atlas = {}
+    for l, rows in glyph_shapes.items():
+        fill = l if c in "APM1234567890 :" else c
+        atlas[l] = tuple(row.replace("#", fill) for row in rows)
+    return atlas
+
+
 def write(time, c):
-    out = ""
-    for i in range(5): #builds output string one line at a time
-        line = "" 
-        for l in time:
-            c = l if c in "APM1234567890 :" else c #checks if preffered character was left blank, updates to appropraite number if so
-            nums = { #hardcoded print formats of each clock character
-                '1': [f" {c} ", f"{c}{c} ", f" {c} ", f" {c} ", f"{c}{c}{c}"], #1
-                '2': [f"{c}{c}{c}", f"  {c}", f"{c}{c}{c}", f"{c}  ", f"{c}{c}{c}"], #2
-                '3': [f"{c}{c}{c}", f"  {c}", f"{c}{c}{c}", f"  {c}", f"{c}{c}{c}"], #3
-                '4': [f"{c} {c}", f"{c} {c}", f"{c}{c}{c}", f"  {c}", f"  {c}"], #4
-                '5': [f"{c}{c}{c}", f"{c}  ", f"{c}{c}{c}", f"  {c}", f"{c}{c}{c}"], #5
-                '6': [f"{c}{c}{c}", f"{c}  ", f"{c}{c}{c}", f"{c} {c}", f"{c}{c}{c}"], #6
-                '7': [f"{c}{c}{c}", f"  {c}", f"  {c}", f"  {c}", f"  {c}"], #7
-                '8': [f"{c}{c}{c}", f"{c} {c}", f"{c}{c}{c}", f"{c} {c}", f"{c}{c}{c}"], #8
-                '9': [f"{c}{c}{c}", f"{c} {c}", f"{c}{c}{c}", f"  {c}", f"{c}{c}{c}"], #9
-                '0': [f"{c}{c}{c}", f"{c} {c}", f"{c} {c}", f"{c} {c}", f"{c}{c}{c}"], #0
-                
-                'A': [f" A ", f"A A", f"AAA", f"A A", f"A A"], #A
-                'P': [f"PPP", f"P P", f"PPP", f"P  ", f"P  "], #P
-                'M': [f"M   M", f"MM MM", f"M M M", f"M   M", f"M   M"], #M
-                ':': [f" ", f":", f" ", f":", f" "] #:
-            }
-            line += str(nums[l][i]) + " "
-        out += line[:-1] + "\n"
-    return out[:-1]
-
-print()
-print(write(time, preferred_char))
\ No newline at end of file
+    atlas = glyph_atlas(c)
+    glyphs = [atlas[l] for l in time]
+    return "\n".join(" ".join(glyph[i] for glyph in glyphs) for i in range(5)) #builds output one line at a time
+
+
+def convert_time(time, clock_type):
+    """ Converts a 24-hour "H:MM" time to what the clock shows: unchanged for 24, "H:MMAM" / "H:MMPM" for 12. """
+
+    if clock_type != 12:
+        return time
+    hour, minute = time.split(":")
+    hour = int(hour)
+    return f"{hour % 12 or 12}:{minute}{'AM' if hour < 12 else 'PM'}"
+
+
+def clock_text(now, clock_type, seconds=True):
+    """ Formats a datetime as the clock shows it: "13:05:09" (24) or "1:05:09PM" (12). """
+
+    shown = f"{now.minute:02d}:{now.second:02d}" if seconds else f"{now.minute:02d}"
+    if clock_type == 12:
+        return f"{now.hour % 12 or 12}:{shown}{'AM' if now.hour < 12 else 'PM'}"
+    return f"{now.hour:02d}:{shown}"
+
+
+def redraw(old_lines, new_lines, top=1):
+    """ Returns the ANSI escapes that turn old_lines into new_lines on screen (row top is the banner's first line):
+        only runs of changed cells are rewritten, and cells past the end of a shorter new line are blanked. """
+
+    out = []
+    for row, (old, new) in enumerate(zip(old_lines, new_lines)):
+        new = new.ljust(len(old))
+        col = 0
+        while col < len(new):
+            if col < len(old) and old[col] == new[col]:
+                col += 1
+                continue
+            start = col
+            while col < len(new) and not (col < len(old) and old[col] == new[col]):
+                col += 1
+            out.append(f"\x1b[{top + row};{start + 1}H{new[start:col]}")
+    return "".join(out)
+
+
+def live(clock_type, c, out=sys.stdout, seconds=True):
+    """ Shows the system time until interrupted, redrawing only the cells that change each tick. """
+
+    lines = [""] * 5
+    out.write("\x1b[2J\x1b[?25l") #clears the screen and hides the cursor
+    try:
+        while True:
+            new_lines = write(clock_text(datetime.now(), clock_type, seconds), c).split("\n")
+            out.write(redraw(lines, new_lines))
+            out.flush()
+            lines = new_lines
+            clock.sleep(1 - clock.time() % 1 if seconds else 60 - clock.time() % 60) #wakes at the next tick
+    except KeyboardInterrupt:
+        pass
+    finally:
+        out.write("\x1b[6;1H\x1b[?25h\n")
+        out.flush()
+
+
+def banner_index(minute, clock_type, c, chars=PERMITTED_CHARS):
+    """ Returns the record number of a banner in a file written by render_all. """
+
+    return (chars.index(c or " ") * len(CLOCK_TYPES) + CLOCK_TYPES.index(clock_type)) * 1440 + minute
+
+
+def all_banners(chars=PERMITTED_CHARS):
+    """ Yields the banner of every minute of the day, for both clock types and every character, in record order. """
+
+    for c in chars:
+        for clock_type in CLOCK_TYPES:
+            for minute in range(1440):
+                yield write(convert_time(f"{minute // 60:02d}:{minute % 60:02d}", clock_type), c)
+
+
+def render_all(file, chars=PERMITTED_CHARS):
+    """ Writes every banner to file as fixed-size records (padded with NUL) after a one-line header,
+        so any banner can be read back at a computed offset. Returns the number of banners written. """
+
+    banners = [banner.encode() for banner in all_banners(chars)]
+    record_size = max(map(len, banners))
+    with open(file, "wb") as f:
+        f.write(f"ascii_clock {record_size} {chars}\n".encode())
+        f.write(b"".join(banner.ljust(record_size, b"\0") for banner in banners))
+    return len(banners)
+
+
+class BannerFile:
+    """ Read-only view of a file written by render_all: each banner() is one slice of a memory map. """
+
+    def __init__(self, file):
+        self._file = open(file, "rb")
+        header = self._file.readline().decode()[:-1]
+        self._start = self._file.tell()  # in bytes: the chars in the header can take more than one byte each
+        _, size, self.chars = header.split(" ", 2)
+        self.record_size = int(size)
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def banner(self, time, clock_type, c):
+        """ Returns the banner for a 24-hour "H:MM" time; 24-hour banners show the hour padded to two digits. """
+
+        hour, minute = time.split(":")
+        offset = self._start + banner_index(int(hour) * 60 + int(minute), clock_type, c, self.chars) * self.record_size
+        return self._map[offset:offset + self.record_size].rstrip(b"\0").decode()
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "render":
+        #bulk mode: ascii_clock.py render [file]   writes every banner for a later BannerFile lookup
+        file = sys.argv[2] if len(sys.argv) > 2 else "banners.bin"
+        print(f"Wrote {render_all(file)} banners to {file}")
+    elif len(sys.argv) > 1 and sys.argv[1] == "live":
+        #live mode: ascii_clock.py live [12|24] [preferred character]
+        live(int(sys.argv[2]) if len(sys.argv) > 2 else 24, sys.argv[3] if len(sys.argv) > 3 else " ")
+    else:
+        time = input("Enter the time: ")
+        clock_type = int(input("Choose the clock type (12 or 24): "))
+        preferred_char = (input("Enter your preferred character: "))
+
+        #ensures that the preffered character is valid:
+        while(not (preferred_char in PERMITTED_CHARS)):
+            preferred_char = (input("Character not permitted! Try again: "))
+
+        time = convert_time(time, clock_type) #reformats number from 24 hours to 12 hours if necesary
+
+        print()
+        print(write(time, preferred_char))
@@ -0,0 +1,66 @@
+# Benchmark: timestamps/sec of ascii_clock.write() with the cached glyph atlas vs the old per-character dict rebuild
+#   python ascii_clock_benchmark.py [N]    renders N timestamps (default 1,000,000)
+import random
+import sys
+import time
+
+from ascii_clock import write
+
+
+def legacy_write(time, c):
+    """ The original ascii_clock.py write(): rebuilds the nums dict for every character of every line. """
+
+    out = ""
+    for i in range(5):
+        line = ""
+        for l in time:
+            c = l if c in "APM1234567890 :" else c
+            nums = {
+                '1': [f" {c} ", f"{c}{c} ", f" {c} ", f" {c} ", f"{c}{c}{c}"],
+                '2': [f"{c}{c}{c}", f"  {c}", f"{c}{c}{c}", f"{c}  ", f"{c}{c}{c}"],
+                '3': [f"{c}{c}{c}", f"  {c}", f"{c}{c}{c}", f"  {c}", f"{c}{c}{c}"],
+                '4': [f"{c} {c}", f"{c} {c}", f"{c}{c}{c}", f"  {c}", f"  {c}"],
+                '5': [f"{c}{c}{c}", f"{c}  ", f"{c}{c}{c}", f"  {c}", f"{c}{c}{c}"],
+                '6': [f"{c}{c}{c}", f"{c}  ", f"{c}{c}{c}", f"{c} {c}", f"{c}{c}{c}"],
+                '7': [f"{c}{c}{c}", f"  {c}", f"  {c}", f"  {c}", f"  {c}"],
+                '8': [f"{c}{c}{c}", f"{c} {c}", f"{c}{c}{c}", f"{c} {c}", f"{c}{c}{c}"],
+                '9': [f"{c}{c}{c}", f"{c} {c}", f"{c}{c}{c}", f"  {c}", f"{c}{c}{c}"],
+                '0': [f"{c}{c}{c}", f"{c} {c}", f"{c} {c}", f"{c} {c}", f"{c}{c}{c}"],
+                'A': [f" A ", f"A A", f"AAA", f"A A", f"A A"],
+                'P': [f"PPP", f"P P", f"PPP", f"P  ", f"P  "],
+                'M': [f"M   M", f"MM MM", f"M M M", f"M   M", f"M   M"],
+                ':': [f" ", f":", f" ", f":", f" "]
+            }
+            line += str(nums[l][i]) + " "
+        out += line[:-1] + "\n"
+    return out[:-1]
+
+
+def random_timestamps(n, seed=0):
+    """ Return: list of n (time, preferred character) pairs, half 24-hour "HH:MM" and half 12-hour "H:MMAM" """
+
+    rng = random.Random(seed)
+    stamps = []
+    for _ in range(n):
+        hour, minute = rng.randrange(24), rng.randrange(60)
+        if rng.random() < 0.5:
+            text = f"{hour:02d}:{minute:02d}"
+        else:
+            text = f"{hour % 12 or 12}:{minute:02d}{'AM' if hour < 12 else 'PM'}"
+        stamps.append((text, rng.choice("abcdeghkmnopqrsuvwxyz@$&*= ")))
+    return stamps
+
+
+def timestamps_per_second(render, stamps):
+    start = time.perf_counter()
+    for text, c in stamps:
+        render(text, c)
+    return len(stamps) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    stamps = random_timestamps(n)
+    assert all(write(text, c) == legacy_write(text, c) for text, c in stamps[:1000])
+    for name, render in [("dict rebuild", legacy_write), ("glyph atlas", write)]:
+        print(f"{name:>12}: {timestamps_per_second(render, stamps):,.0f} timestamps/sec")
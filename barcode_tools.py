@@ -0,0 +1,125 @@
+# Batch barcode validation: detects UPC/EAN/GTIN symbologies by length and checks many codes at once with NumPy
+from itertools import compress
+
+import numpy as np
+
+from batch_tools import map_file
+
+WIDTH = 14  # longest supported code; shorter codes are right-aligned and zero-padded
+_BLANK = b"0" * WIDTH
+
+BLOCK_SIZE = 8 << 20  # bytes read per batch when streaming
+
+# Symbology lookup tables, indexed by symbology id (0 = unknown length, never valid):
+#   symbology_names[id]        name reported in the counts
+#   _symbology_by_length[len]  id of the symbology a code of that length belongs to
+#   _weight_table[id]          weight of each payload column of the right-aligned digit matrix
+symbology_names = ["unknown"]
+_symbology_by_length = np.zeros(WIDTH + 1, dtype=np.intp)
+_weight_table = np.zeros((1, WIDTH - 1), dtype=np.int32)
+
+
+def register_symbology(name, length, weights=None):
+    """ Parameters: name (str), length (int, digits including the check digit),
+        weights (list of int, payload weights left to right; defaults to the GS1 3,1,3,... counted from the right).
+        Adds a symbology that codes of the given length are detected as. The check digit is (10 - sum % 10) % 10. """
+
+    global _weight_table
+    if not 2 <= length <= WIDTH:
+        raise ValueError(f"Symbology length must be between 2 and {WIDTH}")
+    if weights is None:
+        weights = [3 if (length - 2 - i) % 2 == 0 else 1 for i in range(length - 1)]
+    if len(weights) != length - 1:
+        raise ValueError("Need one weight per payload digit")
+
+    row = np.zeros((1, WIDTH - 1), dtype=np.int32)
+    row[0, WIDTH - length:] = weights
+    symbology_names.append(name)
+    _symbology_by_length[length] = len(symbology_names) - 1
+    _weight_table = np.vstack([_weight_table, row])
+
+
+register_symbology("EAN-8", 8)
+register_symbology("UPC-A", 12)
+register_symbology("EAN-13", 13)
+register_symbology("GTIN-14", 14)  # also what ITF-14 encodes; the two can't be told apart by length
+
+
+def digit_matrix(lines):
+    """ Parameters: lines (list of bytes, one code per line).
+        Return: digits (uint8 array, one right-aligned row of WIDTH digits per line),
+                mask (bool array, False for lines that are too long or not all digits),
+                lengths (int array, length of every line) """
+
+    lengths = np.fromiter(map(len, lines), dtype=np.intp, count=len(lines))
+    fits = lengths <= WIDTH
+    padded = b"".join(line.rjust(WIDTH, b"0") if ok else _BLANK for line, ok in zip(lines, fits.tolist()))
+    digits = np.frombuffer(padded, dtype=np.uint8).reshape(-1, WIDTH) - ord("0")
+    mask = fits & (digits <= 9).all(axis=1)  # bytes below "0" wrap around to large values
+    return digits, mask, lengths
+
+
+def classify_barcodes(lines):
+    """ Parameters: lines (list of bytes, one code per line; trailing "\r" is ignored).
+        Detects each code's symbology from its length and checks every row's weighted sum at once.
+        Return: valid (bool array), symbology (int array, index into symbology_names; 0 = unknown) """
+
+    lines = [line.rstrip(b"\r") for line in lines]
+    if not lines:
+        return np.zeros(0, dtype=bool), np.zeros(0, dtype=np.intp)
+    digits, mask, lengths = digit_matrix(lines)
+    symbology = np.where(mask, _symbology_by_length[np.minimum(lengths, WIDTH)], 0)
+    total = np.einsum("ij,ij->i", digits[:, :-1], _weight_table[symbology], dtype=np.int32)
+    check = (10 - total % 10) % 10
+    return (symbology > 0) & (check == digits[:, -1]), symbology
+
+
+def validate_barcodes(lines):
+    """ Return: valid (bool array, True where the code has a known length and a correct check digit) """
+
+    return classify_barcodes(lines)[0]
+
+
+def valid_codes(lines, valid):
+    """ Return: the lines whose entry in valid (bool array) is True """
+
+    return list(compress(lines, valid.tolist()))
+
+
+def read_batches(f, block_size=BLOCK_SIZE):
+    """ Parameters: f (binary file, stdin buffer or mmap; anything with read(n)), block_size (int, bytes per read).
+        Reads fixed-size blocks and splits them into lines, carrying a partial last line into the next block.
+        Return: generator of batches (list of bytes lines) """
+
+    rest = b""
+    while True:
+        block = f.read(block_size)
+        if not block:
+            break
+        lines = (rest + block).split(b"\n")
+        rest = lines.pop()
+        yield lines
+    if rest:
+        yield [rest]
+
+
+def mmap_batches(file, block_size=BLOCK_SIZE):
+    """ Same as read_batches, reading file through a read-only memory map. """
+
+    with map_file(file) as mm:
+        yield from read_batches(mm, block_size)
+
+
+def check_stream(batches, out):
+    """ Parameters: batches (iterable of lists of bytes lines), out (binary file for the valid codes).
+        Validates one batch at a time and writes its valid codes straight away, keeping only running counts.
+        Return: count (int, number of valid codes), by_symbology (dict, symbology name -> valid codes) """
+
+    counts = np.zeros(len(symbology_names), dtype=np.int64)
+    for lines in batches:
+        lines = [line.rstrip(b"\r") for line in lines]
+        valid, symbology = classify_barcodes(lines)
+        out.write(b"".join(number + b"\n" for number in valid_codes(lines, valid)))
+        counts += np.bincount(symbology[valid], minlength=len(symbology_names))
+    by_symbology = {name: int(n) for name, n in zip(symbology_names, counts) if n}
+    return int(counts.sum()), by_symbology
@@ -0,0 +1,36 @@
+# Plumbing shared by the batch tools: read-only memory maps of whole files, and chunked work spread over a
+# process pool with the results handed back in order
+import io
+import mmap
+import multiprocessing
+from contextlib import contextmanager
+
+
+@contextmanager
+def map_file(file):
+    """ Parameters: file (str).
+        Maps the whole file read-only. An empty file, which mmap can't map, gives an empty in-memory file instead.
+        Return: context manager giving a read-only file-like object (read, readline) """
+
+    with open(file, "rb") as f:
+        if f.seek(0, 2) == 0:
+            yield io.BytesIO()
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+
+def map_chunks(worker, tasks, workers=None, initializer=None, initargs=()):
+    """ Parameters: worker (module-level function, task -> result), tasks (list), workers (int, processes to use;
+        defaults to the number of cores), initializer, initargs (run once per process before its first task).
+        Spreads the tasks over a process pool. A single task, or workers=1, runs in this process without a pool.
+        Return: generator of the results, in task order """
+
+    if len(tasks) <= 1 or workers == 1:
+        if initializer is not None:
+            initializer(*initargs)
+        yield from map(worker, tasks)
+        return
+
+    with multiprocessing.Pool(workers, initializer=initializer, initargs=initargs) as pool:
+        yield from pool.imap(worker, tasks)  # imap hands results back in task order
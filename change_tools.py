@@ -0,0 +1,195 @@
+# Batch change making for the Lab 4.16 cashier: amounts are exact integer cents and every transaction's
+# breakdown is computed at once with NumPy, one floor-divide per denomination. For coin systems where greedy isn't
+# optimal, a minimum-coin table per currency (and per drawer inventory) turns each query into a lookup
+from functools import lru_cache
+
+import numpy as np
+
+BATCH_SIZE = 1_000_000  # transactions per batch when streaming a file
+MAX_AMOUNT = 10_000  # default size (in cents) of the minimum-coin tables
+
+# name -> denominations, largest first: list of (value in cents, singular name, plural name)
+currencies = {}
+
+
+def register_currency(name, denominations):
+    """ Parameters: name (str), denominations (list of (cents, singular, plural) tuples, any order).
+        Adds a currency the change functions can use. Include a 1-cent denomination or some amounts can't be paid. """
+
+    denominations = sorted(denominations, key=lambda item: item[0], reverse=True)
+    values = [cents for cents, _, _ in denominations]
+    if not values or min(values) <= 0 or len(set(values)) != len(values):
+        raise ValueError("Denominations must be distinct positive amounts of cents")
+    if name in currencies:
+        change_table.cache_clear()  # tables built for the old denominations are stale
+    currencies[name] = denominations
+
+
+register_currency("US coins", [(25, "quarter", "quarters"), (10, "dime", "dimes"), (5, "nickel", "nickels"),
+                               (1, "penny", "pennies")])
+register_currency("USD", [(10000, "$100 bill", "$100 bills"), (5000, "$50 bill", "$50 bills"),
+                          (2000, "$20 bill", "$20 bills"), (1000, "$10 bill", "$10 bills"),
+                          (500, "$5 bill", "$5 bills"), (100, "$1 bill", "$1 bills")] + currencies["US coins"])
+register_currency("EUR", [(20000, "€200 note", "€200 notes"), (10000, "€100 note", "€100 notes"),
+                          (5000, "€50 note", "€50 notes"), (2000, "€20 note", "€20 notes"),
+                          (1000, "€10 note", "€10 notes"), (500, "€5 note", "€5 notes"),
+                          (200, "€2 coin", "€2 coins"), (100, "€1 coin", "€1 coins"),
+                          (50, "50 cent coin", "50 cent coins"), (20, "20 cent coin", "20 cent coins"),
+                          (10, "10 cent coin", "10 cent coins"), (5, "5 cent coin", "5 cent coins"),
+                          (2, "2 cent coin", "2 cent coins"), (1, "1 cent coin", "1 cent coins")])
+
+
+def to_cents(text):
+    """ Parameters: text (str, an amount like "12", "12.5" or "$12.50").
+        Reads the amount as exact integer cents, with no float rounding.
+        Return: cents (int) """
+
+    text = text.strip().lstrip("$")
+    negative = text.startswith("-")
+    whole, _, fraction = text.lstrip("+-").partition(".")
+    if not (whole or fraction) or not (whole + fraction).isdigit() or len(fraction) > 2:
+        raise ValueError(f"Not an amount of money: {text!r}")
+    cents = int(whole or "0") * 100 + int(fraction.ljust(2, "0"))
+    return -cents if negative else cents
+
+
+def denomination_values(currency):
+    """ Return: int64 NumPy array of the currency's denominations in cents, largest first """
+
+    return np.array([cents for cents, _, _ in currencies[currency]], dtype=np.int64)
+
+
+def breakdown(change, currency="US coins"):
+    """ Parameters: change (int NumPy array or list, amounts in cents), currency (str, a registered currency).
+        Greedy breakdown of every amount: each denomination takes as many of the rest as fit.
+        Return: counts (int64 NumPy array, one row per amount and one column per denomination, largest first) """
+
+    rest = np.array(change, dtype=np.int64)
+    values = denomination_values(currency)
+    counts = np.empty((len(rest), len(values)), dtype=np.int64)
+    for j, cents in enumerate(values.tolist()):
+        counts[:, j], rest = np.divmod(rest, cents)
+    return counts
+
+
+def make_change_many(paid, cost, currency="US coins"):
+    """ Parameters: paid, cost (int NumPy arrays or lists of cents), currency (str).
+        Return: change (int64 NumPy array, cents), counts (breakdown of the change; all 0 where paid < cost),
+                short (bool NumPy array, True where the customer didn't pay enough) """
+
+    change = np.asarray(paid, dtype=np.int64) - np.asarray(cost, dtype=np.int64)
+    short = change < 0
+    counts = breakdown(np.where(short, 0, change), currency)
+    return change, counts, short
+
+
+def read_transactions(file, batch_size=BATCH_SIZE):
+    """ Parameters: file (str, text file with one "paid,cost" row per line; a header row is skipped),
+        batch_size (int, rows per batch).
+        Return: generator of (paid, cost) batches, each a pair of int64 NumPy arrays of cents """
+
+    paid = []
+    cost = []
+    with open(file, "r", buffering=1 << 20) as f:
+        for number, line in enumerate(f):
+            if not line.strip():
+                continue
+            first, _, second = line.partition(",")
+            try:
+                row = to_cents(first), to_cents(second)
+            except ValueError:
+                if number == 0:  # header
+                    continue
+                raise
+            paid.append(row[0])
+            cost.append(row[1])
+            if len(paid) == batch_size:
+                yield np.array(paid, dtype=np.int64), np.array(cost, dtype=np.int64)
+                paid = []
+                cost = []
+    if paid:
+        yield np.array(paid, dtype=np.int64), np.array(cost, dtype=np.int64)
+
+
+def write_breakdowns(batches, out, currency="US coins"):
+    """ Parameters: batches (iterable of (paid, cost) arrays), out (writable text file), currency (str).
+        Writes a CSV row per transaction: the change in cents, then the count of every denomination
+        (a negative change and all 0 counts when the customer didn't pay enough).
+        Return: count (int, transactions written), short (int, transactions that didn't pay enough) """
+
+    header = ",".join(["change"] + [plural for _, _, plural in currencies[currency]])
+    out.write(header + "\n")
+    count = 0
+    short_count = 0
+    for paid, cost in batches:
+        change, counts, short = make_change_many(paid, cost, currency)
+        rows = np.column_stack([change, counts])
+        np.savetxt(out, rows, fmt="%d", delimiter=",")
+        count += len(change)
+        short_count += int(short.sum())
+    return count, short_count
+
+
+def _knapsack_table(values, limits, max_amount):
+    """ Parameters: values (list of int, denominations in cents), limits (list of int, pieces available of each),
+        max_amount (int).
+        Bounded knapsack: every limit is split into bundles of 1, 2, 4, ... pieces and each bundle is offered once,
+        one NumPy pass over all amounts per bundle.
+        Return: pieces (int64 NumPy array, fewest pieces for every amount 0..max_amount; -1 if it can't be made),
+                counts (int32 NumPy array, the pieces of each denomination used, one row per amount) """
+
+    unreachable = np.iinfo(np.int64).max // 2
+    best = np.full(max_amount + 1, unreachable, dtype=np.int64)
+    best[0] = 0
+    counts = np.zeros((max_amount + 1, len(values)), dtype=np.int32)
+    for j, (cents, limit) in enumerate(zip(values, limits)):
+        bundle = 1
+        while limit > 0:
+            take = min(bundle, limit)
+            limit -= take
+            bundle *= 2
+            step = take * cents
+            if step > max_amount:
+                continue
+            candidate = best[:-step] + take  # built from the table before this bundle, so it's used at most once
+            better = np.nonzero(candidate < best[step:])[0]
+            rows = counts[better]
+            rows[:, j] += take
+            best[better + step] = candidate[better]
+            counts[better + step] = rows
+    best[best == unreachable] = -1
+    return best, counts
+
+
+@lru_cache(maxsize=32)
+def change_table(currency, max_amount=MAX_AMOUNT, drawer=None):
+    """ Parameters: currency (str), max_amount (int, largest amount in cents the table covers),
+        drawer (tuple of int, pieces of each denomination on hand, largest first; None for unlimited).
+        Builds (once per currency, size and drawer) the minimum-piece breakdown of every amount up to max_amount.
+        Return: pieces, counts (see _knapsack_table) """
+
+    values = denomination_values(currency).tolist()
+    if drawer is None:
+        limits = [max_amount // cents for cents in values]
+    elif len(drawer) != len(values):
+        raise ValueError("Need one drawer count per denomination")
+    else:
+        limits = list(drawer)
+    return _knapsack_table(values, limits, max_amount)
+
+
+def optimal_change_many(paid, cost, currency="US coins", max_amount=MAX_AMOUNT, drawer=None):
+    """ Parameters: paid, cost (int NumPy arrays or lists of cents), currency (str), max_amount (int),
+        drawer (tuple of int, pieces on hand of each denomination, largest first; None for unlimited).
+        Fewest-pieces change for any coin system, looked up in the cached change_table.
+        Return: change (int64 NumPy array, cents), counts (breakdown of the change; all 0 where it can't be made),
+                unpaid (bool NumPy array, True where paid < cost, the change is over max_amount,
+                or the drawer can't make it) """
+
+    change = np.asarray(paid, dtype=np.int64) - np.asarray(cost, dtype=np.int64)
+    pieces, table = change_table(currency, max_amount, None if drawer is None else tuple(drawer))
+    payable = (change >= 0) & (change <= max_amount)
+    amount = np.where(payable, change, 0)
+    payable &= pieces[amount] >= 0
+    counts = np.where(payable[:, None], table[amount], 0).astype(np.int64)
+    return change, counts, ~payable
@@ -1,4 +1,12 @@
 # Program that takes arbitrary x, y data pairs, then calculates linear interpolation / extrapolation for any x
+# Batch mode: python cheesy_llamas.py DATA QUERIES [dependent variable] [linear|cubic|pchip]
+#   DATA is x,y pairs and QUERIES is x-values, each as a .csv or .npy file
+import sys
+
+import numpy as np
+
+from interpolation_table import InterpolationTable
+
 f = open("nailed_it.txt", "w")
   
 def get_user_data():
@@ -32,47 +40,6 @@ def write_input(x_list, y_list, v):
     f.write("---------------------------------------------------------------\n")
     
 
-def reorder_lists(x_list, y_list):
-    """ parameters: x_list (list, contains x-values), y_list (list, contains y-values).
-        Function finds min of list, and appends that value to a new list. Takes same indexed value from y-list into
-        ordered y-list at the same time.
-        return: ord_x (list, ordered x-list), ord_y (list, ordered y-list). """
-
-    # ---- REORDER THE LISTS ----
-    ord_x = []
-    ord_y = []
-    for i in range(len(x_list)):
-        min_index = x_list.index(min(x_list))
-        ord_x.append(x_list.pop(min_index))
-        ord_y.append(y_list.pop(min_index))
-    return ord_x, ord_y
-
-
-def extrapolate(x_list, y_list, x):
-    """ parameters: x_list (list, contains x-values), y_list (list, contains y-values), x (float, current x-value).
-        Function finds whether this x is above or below the data set, and then extrapolates the y-value. Function
-        return: y (float), and string 'extrapolated' """
-
-    if x < x_list[0]:  # extrapolate low
-        y = y_list[0] + ((x - x_list[0]) / (x_list[1] - x_list[0])) * (y_list[1] - y_list[0])
-    elif x > x_list[-1]:  # extrapolate high
-        y = y_list[-2] + (x - x_list[-2]) / (x_list[-1] - x_list[-2]) * (y_list[-1] - y_list[-2])
-    return y, 'extrapolated'
-
-
-def interpolate(xlist, ylist, xvalue):
-    """ parameters: x_list (list, contains x-values), y_list (list, contains y-values), x (float, current x-value).
-        Function finds which data x values the current x falls between, and then interpolates the y-value.
-        return: y (float), and string 'interpolated' """
-
-    for i in range(len(xlist) - 1):
-        if xlist[i] <= xvalue <= xlist[i + 1]:
-            # lower_x_int = xlist[i]
-            # upper_x_int = xlist[i + 1]
-            y = ylist[i] + (xvalue - xlist[i]) * (ylist[i + 1] - ylist[i]) / (xlist[i + 1] - xlist[i])
-    return y, 'interpolated'
-
-
 def print_to_screen(x, y, t):
     """ parameters: x (float), y (float), t (string).
         Function prints to screen the x, corresponding y, and whether it was interpolated or extrapolated.
@@ -94,18 +61,54 @@ def print_to_file(x, y, t):
 
 
 
+def load_array(file_name):
+    """ parameters: file_name (str, a .npy file or a comma-separated text file).
+        return: NumPy array of the values in the file """
+
+    if file_name.endswith('.npy'):
+        return np.load(file_name)
+    return np.loadtxt(file_name, delimiter=',', ndmin=1)
+
+
+def run_batch(data_file, query_file, v, mode='linear'):
+    """ parameters: data_file (str, x,y pairs), query_file (str, x-values), v (str, dependent variable),
+        mode (str, 'linear', 'cubic' spline or monotone 'pchip').
+        Function estimates every query at once, labels each one interpolated or extrapolated with a mask, and
+        writes the header, data and all results to the file in a single write.
+        return: y (NumPy array), interpolated (bool NumPy array) """
+
+    points = load_array(data_file).reshape(-1, 2)
+    queries = load_array(query_file).ravel()
+    write_input(points[:, 0].tolist(), points[:, 1].tolist(), v)
+
+    y, interpolated = InterpolationTable(points[:, 0], points[:, 1], mode).estimate_many(queries)
+    labels = np.where(interpolated, 'interpolated', 'extrapolated')
+
+    # ---- WRITE ALL X-Y VALUES AND ESTIMATION TYPES WITH ONE CALL ----
+    f.write(''.join(f"{f'{x}, {y_val:.1f}':<15} {t}\n"
+                    for x, y_val, t in zip(queries.astype(np.int64).tolist(), y.tolist(), labels.tolist())))
+    return y, interpolated
+
 
 #########################################################################
 # ----------------------------- MAIN CODE ----------------------------- #
 
+# ---- Batch mode: no prompts, everything comes from the files on the command line
+if len(sys.argv) > 2:
+    y_vals, interpolated = run_batch(sys.argv[1], sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else 'y',
+                                     sys.argv[4] if len(sys.argv) > 4 else 'linear')
+    f.close()
+    print(f'Wrote {len(y_vals)} estimates ({int(interpolated.sum())} interpolated) to nailed_it.txt')
+    sys.exit()
+
 # ---- Take user inputs
 x_data, y_data, variable = get_user_data()
 
 # ---- Write the inputs formatted into correct file
 write_input(x_data, y_data, variable)
 
-# ---- Order the values for the estimation
-ordered_x, ordered_y = reorder_lists(x_data, y_data)
+# ---- Sort the values once and precompute each segment's slope for the estimation
+table = InterpolationTable(x_data, y_data)
 
 # ---- Repeatedly take values from user and estimate the y value
 x_val = input("Enter an x value ('q' to quit): ")
@@ -113,11 +116,8 @@ x_val = input("Enter an x value ('q' to quit): ")
 while x_val != 'q':
     x_val_float = float(x_val)
 
-    # Determine if y-value needs to be extrapolated or interpoled
-    if x_val_float < ordered_x[0] or x_val_float > ordered_x[-1]:
-        y_val, y_type = extrapolate(ordered_x, ordered_y, x_val_float)
-    else:
-        y_val, y_type = interpolate(ordered_x, ordered_y, x_val_float)
+    # Binary search for the segment; the end segments are extended if the y-value needs to be extrapolated
+    y_val, y_type = table.estimate(x_val_float)
 
     # Print x, y and type of estimation to the screen and external file
     print_to_screen(x_val, y_val, y_type)
@@ -0,0 +1,269 @@
+# Sorted x/y table for interpolation / extrapolation: sorted once, segment coefficients precomputed, queries by
+# binary search. Modes: 'linear' (piecewise linear), 'cubic' (natural cubic spline), 'pchip' (monotone cubic)
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+MODES = ('linear', 'cubic', 'pchip')
+
+
+def _solve_tridiagonal(lower, diag, upper, rhs):
+    """ parameters: lower, diag, upper (NumPy arrays, the three diagonals; lower[0] and upper[-1] are unused),
+        rhs (NumPy array). Thomas algorithm, O(n).
+        return: solution (NumPy array) """
+
+    n = len(diag)
+    c = np.zeros(n)
+    d = np.zeros(n)
+    c[0] = upper[0] / diag[0]
+    d[0] = rhs[0] / diag[0]
+    for i in range(1, n):
+        denom = diag[i] - lower[i] * c[i - 1]
+        c[i] = upper[i] / denom if i < n - 1 else 0.0
+        d[i] = (rhs[i] - lower[i] * d[i - 1]) / denom
+    for i in range(n - 2, -1, -1):
+        d[i] -= c[i] * d[i + 1]
+    return d
+
+
+def _natural_spline_second_derivatives(h, slopes):
+    """ return: second derivative at every point of the natural cubic spline (zero at both ends) """
+
+    n = len(h) + 1
+    second = np.zeros(n)
+    if n > 2:
+        lower = np.concatenate(([0.0], h[1:-1]))
+        upper = np.concatenate((h[1:-1], [0.0]))
+        diag = 2 * (h[:-1] + h[1:])
+        second[1:-1] = _solve_tridiagonal(lower, diag, upper, 6 * np.diff(slopes))
+    return second
+
+
+def _pchip_derivatives(h, slopes):
+    """ return: derivative at every point for a shape-preserving (Fritsch-Carlson) cubic Hermite interpolant """
+
+    n = len(h) + 1
+    if n == 2:
+        return np.array([slopes[0], slopes[0]])
+
+    derivs = np.zeros(n)
+    # interior: weighted harmonic mean of the neighbouring slopes, or 0 at a local extremum
+    w1 = 2 * h[1:] + h[:-1]
+    w2 = h[1:] + 2 * h[:-1]
+    same_sign = slopes[:-1] * slopes[1:] > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        harmonic = (w1 + w2) / (w1 / slopes[:-1] + w2 / slopes[1:])
+    derivs[1:-1] = np.where(same_sign, harmonic, 0.0)
+
+    # ends: three-point estimate, limited so the end segments stay monotone
+    for end, h0, h1, s0, s1 in ((0, h[0], h[1], slopes[0], slopes[1]), (-1, h[-1], h[-2], slopes[-1], slopes[-2])):
+        d = ((2 * h0 + h1) * s0 - h0 * s1) / (h0 + h1)
+        if np.sign(d) != np.sign(s0):
+            d = 0.0
+        elif np.sign(s0) != np.sign(s1) and abs(d) > abs(3 * s0):
+            d = 3 * s0
+        derivs[end] = d
+    return derivs
+
+
+class InterpolationTable:
+    """ Estimate of y for any x from a set of (x, y) data points.
+        Points are sorted once (O(n log n)) and each segment's polynomial y = a + b*t + c*t**2 + d*t**3
+        (t = x - segment start) is solved up front, so a query is a binary search plus a Horner evaluation.
+        Outside the data, the first or last segment's polynomial is extended. """
+
+    def __init__(self, x_list, y_list, mode='linear'):
+        """ parameters: x_list (list, x-values in any order), y_list (list, matching y-values),
+            mode (str, 'linear', 'cubic' or 'pchip'). Needs at least two points; the cubic modes need distinct x. """
+
+        if len(x_list) != len(y_list):
+            raise ValueError("x and y lists must be the same length")
+        if len(x_list) < 2:
+            raise ValueError("Need at least two data points")
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {', '.join(MODES)}")
+
+        pairs = sorted(zip(x_list, y_list), key=lambda pair: pair[0])
+        self.mode = mode
+        self.x = [float(x) for x, _ in pairs]
+        self.y = [float(y) for _, y in pairs]
+        # repeated x-values make a zero-width segment; binary search never lands in one, so give it slope 0
+        self.slopes = [(self.y[i + 1] - self.y[i]) / (self.x[i + 1] - self.x[i]) if self.x[i + 1] != self.x[i] else 0.0
+                       for i in range(len(self.x) - 1)]
+
+        # array copies for the batch API
+        self.x_array = np.array(self.x)
+        self.y_array = np.array(self.y)
+        self.slope_array = np.array(self.slopes)
+        self.coefficients = self._solve_coefficients()  # shape (4, segments): a, b, c, d
+        self._coefficient_lists = self.coefficients.tolist()
+
+    def _solve_coefficients(self):
+        """ return: NumPy array of the a, b, c, d coefficients of every segment for this table's mode """
+
+        a = self.y_array[:-1]
+        s = self.slope_array
+        if self.mode == 'linear':
+            zeros = np.zeros_like(s)
+            return np.array([a, s, zeros, zeros])
+
+        h = np.diff(self.x_array)
+        if (h <= 0).any():
+            raise ValueError(f"'{self.mode}' mode needs distinct x-values")
+
+        if self.mode == 'cubic':
+            m = _natural_spline_second_derivatives(h, s)
+            b = s - h * (2 * m[:-1] + m[1:]) / 6
+            c = m[:-1] / 2
+            d = (m[1:] - m[:-1]) / (6 * h)
+        else:
+            derivs = _pchip_derivatives(h, s)
+            b = derivs[:-1]
+            c = (3 * s - 2 * derivs[:-1] - derivs[1:]) / h
+            d = (derivs[:-1] + derivs[1:] - 2 * s) / h ** 2
+        return np.array([a, b, c, d])
+
+    def segment(self, x):
+        """ return: index (int) of the segment used for x; the end segments also cover extrapolation """
+
+        return min(max(bisect_right(self.x, x) - 1, 0), len(self.slopes) - 1)
+
+    def estimate(self, x):
+        """ parameters: x (float).
+            return: y (float), and 'interpolated' or 'extrapolated' """
+
+        i = self.segment(x)
+        a, b, c, d = (coefficient[i] for coefficient in self._coefficient_lists)
+        t = x - self.x[i]
+        y = a + t * (b + t * (c + t * d))
+        return y, 'interpolated' if self.x[0] <= x <= self.x[-1] else 'extrapolated'
+
+    def estimate_many(self, x_values):
+        """ parameters: x_values (NumPy array or list of floats).
+            return: y (NumPy array), interpolated (bool NumPy array, False where the value was extrapolated) """
+
+        x_values = np.asarray(x_values, dtype=float)
+        i = np.clip(np.searchsorted(self.x_array, x_values, side='right') - 1, 0, len(self.slopes) - 1)
+        a, b, c, d = self.coefficients[:, i]
+        t = x_values - self.x_array[i]
+        y = a + t * (b + t * (c + t * d))
+        interpolated = (x_values >= self.x[0]) & (x_values <= self.x[-1])
+        return y, interpolated
+
+
+class StreamingTable:
+    """ Linear interpolation / extrapolation over points that keep arriving, in any x order.
+        Points live in a list of sorted blocks (each at most 2 * LOAD long) with a list of block maxima, so an insert
+        is a binary search over the blocks plus one within a block, and queries never need a full re-sort.
+        Old points can be evicted from the low-x end, e.g. to keep only a recent time window. """
+
+    LOAD = 512
+
+    def __init__(self):
+        self._xs = []  # sorted blocks of x-values
+        self._ys = []  # matching blocks of y-values
+        self._maxes = []  # last x of every block
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def _bisect_right(self, x):
+        """ return: (block, index) of the first point with an x-value greater than x """
+
+        b = bisect_right(self._maxes, x)
+        if b == len(self._maxes):
+            return b - 1, len(self._xs[-1])
+        return b, bisect_right(self._xs[b], x)
+
+    def _prev(self, pos):
+        b, i = pos
+        return (b, i - 1) if i > 0 else (b - 1, len(self._xs[b - 1]) - 1)
+
+    def _next(self, pos):
+        b, i = pos
+        return (b, i + 1) if i + 1 < len(self._xs[b]) else (b + 1, 0)
+
+    def insert(self, x, y):
+        """ parameters: x (float), y (float). A point with the same x as an existing one replaces its y. """
+
+        x, y = float(x), float(y)
+        if not self._xs:
+            self._xs.append([x])
+            self._ys.append([y])
+            self._maxes.append(x)
+            self._len = 1
+            return
+
+        b = min(bisect_left(self._maxes, x), len(self._maxes) - 1)  # first block that can hold x
+        xs, ys = self._xs[b], self._ys[b]
+        i = bisect_left(xs, x)
+        if i < len(xs) and xs[i] == x:
+            ys[i] = y
+            return
+
+        xs.insert(i, x)
+        ys.insert(i, y)
+        self._maxes[b] = xs[-1]
+        self._len += 1
+
+        if len(xs) > 2 * self.LOAD:  # split a full block in half
+            self._xs[b:b + 1] = [xs[:self.LOAD], xs[self.LOAD:]]
+            self._ys[b:b + 1] = [ys[:self.LOAD], ys[self.LOAD:]]
+            self._maxes[b:b + 1] = [xs[self.LOAD - 1], xs[-1]]
+
+    def evict_before(self, cutoff):
+        """ parameters: cutoff (float). Removes every point with x < cutoff.
+            return: removed (int, number of points evicted) """
+
+        removed = 0
+        while self._xs and self._maxes[0] < cutoff:  # whole stale blocks
+            removed += len(self._xs[0])
+            del self._xs[0], self._ys[0], self._maxes[0]
+        if self._xs:
+            i = bisect_right(self._xs[0], cutoff)
+            if i and self._xs[0][i - 1] == cutoff:
+                i -= 1
+            del self._xs[0][:i], self._ys[0][:i]
+            removed += i
+        self._len -= removed
+        return removed
+
+    def evict_older_than(self, window):
+        """ parameters: window (float). Keeps only points within window of the newest x (e.g. a time window).
+            return: removed (int, number of points evicted) """
+
+        if not self._xs:
+            return 0
+        return self.evict_before(self._maxes[-1] - window)
+
+    def points(self):
+        """ return: x (list), y (list) of every point in x order """
+
+        return [x for xs in self._xs for x in xs], [y for ys in self._ys for y in ys]
+
+    def estimate(self, x):
+        """ parameters: x (float).
+            return: y (float), and 'interpolated' or 'extrapolated' """
+
+        if self._len < 2:
+            raise ValueError("Need at least two data points")
+
+        first, last = (0, 0), (len(self._xs) - 1, len(self._xs[-1]) - 1)
+        pos = self._bisect_right(x)
+        left = first if pos == first else self._prev(pos)
+        if left == last:
+            left = self._prev(last)
+        right = self._next(left)
+
+        x0, y0 = self._xs[left[0]][left[1]], self._ys[left[0]][left[1]]
+        x1, y1 = self._xs[right[0]][right[1]], self._ys[right[0]][right[1]]
+        y = y0 + (x - x0) * (y1 - y0) / (x1 - x0)
+        return y, 'interpolated' if self._xs[0][0] <= x <= self._maxes[-1] else 'extrapolated'
+
+    def estimate_many(self, x_values, mode='linear'):
+        """ parameters: x_values (NumPy array or list of floats), mode (str, any InterpolationTable mode).
+            Snapshots the current points into an InterpolationTable (linear time, they are already sorted).
+            return: y (NumPy array), interpolated (bool NumPy array) """
+
+        return InterpolationTable(*self.points(), mode).estimate_many(x_values)
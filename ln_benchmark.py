@@ -0,0 +1,124 @@
+# Benchmark and accuracy sweep of the ln approximations over x in (0, 2] and tolerances across many decades:
+#   python ln_benchmark.py [OUT]    writes OUT.json (default ln_benchmark.json) and OUT.png
+import json
+import sys
+import time
+
+import matplotlib
+matplotlib.use("Agg")  # only writes files, no window needed
+import matplotlib.pyplot as plt
+import numpy as np
+
+from ln_tools import mercator_ln, mercator_terms, ln_series_many, fast_ln, ln_errors
+
+TOLERANCES = [10.0 ** -k for k in range(1, 15)]
+LOOP_TERM_LIMIT = 100_000  # the loop needs about 1/tol terms next to 0 and 2; points past this are skipped for it
+BATCH_POINTS = 100_000  # the vectorized engines are timed on the sweep repeated up to this many points
+
+
+def sweep_x(n=400):
+    """ Return: NumPy array of n points spread over (0, 2], denser next to 0 and 2 where the series is slowest """
+
+    t = np.linspace(0, 1, n + 1)[1:]
+    return 1 - np.cos(np.pi * t)  # t = 1 gives exactly 2; t = 0, the only point at 0, is left out
+
+
+def _loop_engine(x, tol):
+    results = [mercator_ln(value, tol) for value in x.tolist()]
+    return np.array([v for v, _ in results]), np.array([n for _, n in results])
+
+
+def _fast_engine(x, tol):
+    return fast_ln(x, tol)
+
+
+engines = {
+    "loop": _loop_engine,
+    "table+Horner": ln_series_many,
+    "atanh": _fast_engine,
+}
+
+
+def measure(engine, x, tol, batch_points=None):
+    """ Parameters: engine (function (x array, tol) -> (values, terms)), x (NumPy array), tol (float),
+        batch_points (int, optional: time the engine on x repeated up to this many points, so a vectorized engine's
+        fixed cost per call is spread over a realistic batch; errors and terms still cover x).
+        Return: dict of points and timed points, time per evaluation (s), mean and max terms,
+                max absolute and relative error """
+
+    batch = np.resize(x, batch_points) if batch_points else x  # repeats x, so its first len(x) entries are x
+    start = time.perf_counter()
+    values, terms = engine(batch, tol)
+    elapsed = time.perf_counter() - start
+    values, terms = values[:len(x)], terms[:len(x)]
+    error, relative = ln_errors(x, values)
+    return {
+        "points": len(x),
+        "timed_points": len(batch),
+        "time_per_eval": elapsed / len(batch),
+        "mean_terms": float(np.mean(terms)),
+        "max_terms": int(np.max(terms)),
+        "max_abs_error": float(error.max()),
+        "max_rel_error": float(relative.max()),
+    }
+
+
+def run_sweep(x, tolerances=TOLERANCES, batch_points=BATCH_POINTS):
+    """ Runs every engine on x for every tolerance. The loop and table engines skip the points whose term count
+        would pass LOOP_TERM_LIMIT (the "points" entry says how many were kept). The vectorized engines are timed on
+        batch_points points, the loop on the sweep itself (the "timed_points" entry).
+        Return: results (dict, engine name -> list of measure() dicts, one per tolerance) """
+
+    results = {name: [] for name in engines}
+    for tol in tolerances:
+        feasible = x[mercator_terms(x, tol) <= LOOP_TERM_LIMIT]
+        for name, engine in engines.items():
+            results[name].append(measure(engine, x if name == "atanh" else feasible, tol,
+                                         None if name == "loop" else batch_points))
+    return results
+
+
+def plot_results(results, tolerances, file):
+    """ Saves time per evaluation and max absolute error against tolerance for every engine to file. """
+
+    colors = {"loop": "red", "table+Horner": "blue", "atanh": "green"}
+
+    #first plot
+    plt.subplot(2, 1, 1)
+    for name, rows in results.items():
+        label = f"{name} (timed on {max(row['timed_points'] for row in rows):,} points)"
+        plt.plot(tolerances, [row["time_per_eval"] for row in rows], 'o-', color=colors.get(name), label=label)
+    plt.title('ln approximations vs tolerance')
+    plt.xscale('log')
+    plt.yscale('log')
+    plt.ylabel('time per evaluation (s)')
+    plt.legend()
+
+    #second plot
+    plt.subplot(2, 1, 2)
+    for name, rows in results.items():
+        plt.plot(tolerances, [max(row["max_abs_error"], 1e-18) for row in rows], '^-', color=colors.get(name))
+    plt.plot(tolerances, tolerances, 'k--')
+    plt.xscale('log')
+    plt.yscale('log')
+    plt.xlabel('tolerance')
+    plt.ylabel('max absolute error')
+
+    plt.savefig(file)
+    plt.close()
+
+
+if __name__ == "__main__":
+    out = sys.argv[1] if len(sys.argv) > 1 else "ln_benchmark"
+    x = sweep_x()
+    results = run_sweep(x)
+    with open(f"{out}.json", "w") as f:
+        json.dump({"x": x.tolist(), "tolerances": TOLERANCES, "batch_points": BATCH_POINTS, "engines": results}, f,
+                  indent=1)
+    plot_results(results, TOLERANCES, f"{out}.png")
+
+    for name, rows in results.items():
+        print(f"{name}:")
+        for tol, row in zip(TOLERANCES, rows):
+            print(f"  tol {tol:.0e}: {row['time_per_eval'] * 1e9:>10,.0f} ns/eval, {row['mean_terms']:>9,.1f} terms, "
+                  f"max error {row['max_abs_error']:.1e} ({row['points']} points, timed on {row['timed_points']:,})")
@@ -0,0 +1,164 @@
+# Natural log engines for the Lab 5.16 approximation: the original Mercator series loop, and a vectorized engine
+# that reduces any positive x to a mantissa near 1 and sums the faster-converging atanh series
+import math
+from functools import lru_cache
+
+import numpy as np
+
+MAX_TERMS = 1_000_000  # most Mercator terms the tables cover; near x = 0 or 2 the series needs about 1/tol of them
+
+
+def mercator_ln(x, tol):
+    """ Parameters: x (float, 0 < x <= 2), tol (float, smallest term magnitude still added).
+        The original approximate_ln.py loop: ln(x) = (x-1) - (x-1)**2/2 + (x-1)**3/3 - ...
+        Return: value (float), terms (int, number of series terms summed) """
+
+    val = x - 1
+    n = 2
+    next = (((x-1) ** n) / n) * (-1, 1)[n%2]
+    while (abs(next)>=tol):
+        val += next
+        n += 1
+        next = (((x-1) ** n) / n) * (-1, 1)[n%2]
+    return val, n - 1
+
+
+@lru_cache(maxsize=None)
+def term_thresholds(tol):
+    """ Parameters: tol (float).
+        Term n of the Mercator series, |x-1|**n / n, is added while it is at least tol, i.e. while
+        |x-1| >= (n*tol)**(1/n). That bound rises with n (for n <= 1/tol), so it is tabulated once per tolerance,
+        up to one term past MAX_TERMS so a lookup can tell when a point needs more than the table covers.
+        Return: thresholds (NumPy array, entry k is the smallest |x-1| that still adds term k+2) """
+
+    n = np.arange(2, min(int(1 / tol), MAX_TERMS + 1) + 1, dtype=float)
+    return (n * tol) ** (1 / n)
+
+
+def mercator_terms(x, tol):
+    """ Parameters: x (float or NumPy array, 0 < x <= 2), tol (float).
+        Return: number of terms mercator_ln sums for each x, looked up in the threshold table; MAX_TERMS + 1 means
+                more than MAX_TERMS, and the true count isn't known """
+
+    return 1 + np.searchsorted(term_thresholds(tol), np.abs(np.asarray(x, dtype=float) - 1), side='right')
+
+
+def _check_terms(terms):
+    if np.max(terms) > MAX_TERMS:
+        raise ValueError(f"Some points need more than {MAX_TERMS:,} series terms at this tolerance; use mercator_ln")
+
+
+def _mercator_coefficients(terms):
+    """ Return: NumPy array of the series coefficients 1, -1/2, 1/3, ... for the first terms terms """
+
+    n = np.arange(1, terms + 1, dtype=float)
+    return np.where(n % 2 == 1, 1.0, -1.0) / n
+
+
+@lru_cache(maxsize=1 << 16)
+def ln_series(x, tol):
+    """ Parameters: x (float, 0 < x <= 2), tol (float).
+        Memoized scalar version of mercator_ln: the term count comes from the table, the sum from a Horner pass.
+        Raises ValueError if x needs more than MAX_TERMS terms.
+        Return: value (float), terms (int) """
+
+    terms = int(mercator_terms(x, tol))
+    _check_terms(terms)
+    u = x - 1
+    acc = 0.0
+    for c in reversed(_mercator_coefficients(terms).tolist()):
+        acc = c + u * acc
+    return u * acc, terms
+
+
+def ln_series_many(x, tol):
+    """ Parameters: x (list or NumPy array, 0 < x <= 2), tol (float or array of floats matching x).
+        Evaluates the Mercator series for every x at once. Each tolerance group runs one fixed-length Horner pass
+        over its longest term count, with the points sorted by term count so step n only touches the prefix of
+        points that need at least n terms. Raises ValueError if any point needs more than MAX_TERMS terms.
+        Return: values (NumPy array), terms (int NumPy array) """
+
+    x = np.asarray(x, dtype=float)
+    tol = np.broadcast_to(np.asarray(tol, dtype=float), x.shape)
+    if ((x <= 0) | (x > 2)).any():
+        raise ValueError("The series only converges for 0 < x <= 2")
+
+    values = np.zeros(x.shape)
+    terms = np.zeros(x.shape, dtype=np.int64)
+    for t in np.unique(tol).tolist():
+        group = np.nonzero(tol == t)
+        u = x[group] - 1
+        n_terms = mercator_terms(x[group], t)
+        _check_terms(n_terms)
+        order = np.argsort(-n_terms, kind='stable')
+        u_sorted = u[order]
+        descending = -n_terms[order]
+        coefficients = _mercator_coefficients(int(n_terms.max())).tolist()
+
+        acc = np.zeros(len(u))
+        for n in range(len(coefficients), 0, -1):
+            k = np.searchsorted(descending, -n, side='right')  # points needing at least n terms
+            acc[:k] = coefficients[n - 1] + u_sorted[:k] * acc[:k]
+        group_values = np.empty(len(u))
+        group_values[order] = u_sorted * acc
+        values[group] = group_values
+        terms[group] = n_terms
+    return values, terms
+
+
+def _atanh_ln(z, tol):
+    """ Parameters: z (NumPy array, |z| well below 1), tol (float).
+        Sums ln((1+z)/(1-z)) = 2*(z + z**3/3 + z**5/5 + ...), adding each term while its magnitude is at least tol.
+        Return: values (NumPy array), terms (int NumPy array, number of terms summed for each z) """
+
+    z2 = z * z
+    power = z.copy()
+    total = 2 * z
+    terms = np.ones(z.shape, dtype=np.int64)
+    active = np.ones(z.shape, dtype=bool)
+    k = 1
+    while True:
+        power *= z2
+        term = 2 * power / (2 * k + 1)
+        active &= np.abs(term) >= tol
+        if not active.any():
+            return total, terms
+        total += np.where(active, term, 0.0)
+        terms += active
+        k += 1
+
+
+LN2 = 0.6931471805599453  # ln(2) rounded to double; summing the series for z = 1/3 lands one ulp off
+
+
+def fast_ln(x, tol=1e-16):
+    """ Parameters: x (float, list or NumPy array of positive floats), tol (float, smallest term magnitude still added).
+        Splits every x into mantissa * 2**exponent with the mantissa in [sqrt(1/2), sqrt(2)), so the atanh series
+        argument (m-1)/(m+1) stays below 0.172 and each term gains about 1.5 digits.
+        Return: values (NumPy array, ln x), terms (int NumPy array, series terms used for each x) """
+
+    x = np.asarray(x, dtype=float)
+    if tol <= 0:
+        raise ValueError("Tolerance must be positive")
+    if not (np.isfinite(x) & (x > 0)).all():
+        raise ValueError("ln is only defined for positive, finite x")
+
+    mantissa, exponent = np.frexp(x)  # mantissa in [0.5, 1)
+    low = mantissa < math.sqrt(0.5)
+    mantissa = np.where(low, 2 * mantissa, mantissa)
+    exponent = np.where(low, exponent - 1, exponent)
+
+    series, terms = _atanh_ln((mantissa - 1) / (mantissa + 1), tol)
+    return series + exponent * LN2, terms
+
+
+def ln_errors(x, values):
+    """ Parameters: x (list or NumPy array of positive floats), values (NumPy array, approximations of ln x).
+        Return: absolute error (NumPy array), relative error (NumPy array; 0 where ln x is 0) against math.log """
+
+    x = np.asarray(x, dtype=float)
+    exact = np.fromiter(map(math.log, x.ravel()), dtype=float, count=x.size).reshape(x.shape)
+    error = np.abs(np.asarray(values, dtype=float) - exact)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        relative = np.where(exact != 0, error / np.abs(exact), 0.0)
+    return error, relative
@@ -11,40 +11,26 @@
 # Assignment: Lab 4.16
 # Date: 08 September 2025
 
-import math
+import sys
+
+from change_tools import to_cents, make_change_many, currencies, read_transactions, write_breakdowns
+
+# batch mode: make_change.py TRANSACTIONS [CURRENCY]   ("paid,cost" rows in, change.csv out)
+if len(sys.argv) > 1:
+    currency = sys.argv[2] if len(sys.argv) > 2 else "US coins"
+    with open("change.csv", "w", buffering=1 << 20) as out:
+        count, short = write_breakdowns(read_transactions(sys.argv[1]), out, currency)
+    print(f"Made change for {count} transactions ({short} didn't pay enough)")
+    sys.exit()
 
 # insert readable code
-pay = 100*float(input("How much did you pay? "))
-cost = 100*float(input("How much did it cost? "))
-change = (pay-cost)
-quarts = change // 25
-change -= 25 * quarts
-dimes = change // 10
-change -= 10 * dimes
-nicks = change // 5
-change -= 5*nicks
-pennies = int(change)
+pay = to_cents(input("How much did you pay? "))
+cost = to_cents(input("How much did it cost? "))
+change, counts, short = make_change_many([pay], [cost])
 
 
 print(f"You received ${(pay-cost)/100:.2f} in change. That is...")
-if(quarts > 0):
-    if(quarts == 1):
-        print(f"{int(quarts)} quarter")
-    else:
-        print(f"{int(quarts)} quarters")
-if(dimes > 0):
-    if(dimes == 1):
-        print(f"{int(dimes)} dime")
-    else:
-        print(f"{int(dimes)} dimes")
-if(nicks > 0):
-    if(nicks == 1):
-        print(f"{int(nicks)} nickel")
-    else:
-        print(f"{int(nicks)} nickels")
-if(pennies > 0):
-    if(pennies == 1):
-        print(f"{int(pennies)} penny")
-    else:
-        print(f"{int(pennies)} pennies")
+for (cents, singular, plural), n in zip(currencies["US coins"], counts[0].tolist()):
+    if(n > 0):
+        print(f"{n} {singular if n == 1 else plural}")
 
@@ -0,0 +1,127 @@
+# Benchmarks for the passport checkers:
+#   python passport_benchmark.py               records/sec of the single-pass field parser vs the old index-and-slice checks,
+#                                              and of the compiled validator alone on records parsed beforehand
+#   python passport_benchmark.py FILE [GB]     parallel scaling on FILE (a synthetic one of GB gigabytes is written if missing)
+import multiprocessing
+import os
+import random
+import re
+import sys
+import time
+
+from passport_tools import (parse_record, has_required_fields, compile_rules, validate_parallel, passport_rules,
+                            required, eyes, BUFFER_SIZE)
+
+
+def synthetic_records(n, seed=0):
+    """ Parameters: n (int, number of records), seed (int).
+        Builds random passport records, most of them valid and some with missing or bad fields.
+        Return: list of records (str) """
+
+    rng = random.Random(seed)
+    hex_digits = "0123456789abcdef"
+    makers = {
+        "byr": lambda: str(rng.randint(1920, 2005)),
+        "iyr": lambda: str(rng.randint(2010, 2030)),
+        "eyr": lambda: str(rng.randint(2020, 2040)),
+        "hgt": lambda: rng.choice([f"{rng.randint(55, 80)}in", f"{rng.randint(145, 200)}cm"]),
+        "hcl": lambda: "#" + "".join(rng.choice(hex_digits) for _ in range(6)),
+        "ecl": lambda: rng.choice(eyes + ["xry"]),
+        "pid": lambda: str(rng.randint(0, 10**9 - 1)).zfill(9),
+        "cid": lambda: str(rng.randint(90, 999)),
+    }
+    records = []
+    for _ in range(n):
+        fields = [f"{key}:{make()}" for key, make in makers.items() if rng.random() < 0.95]
+        rng.shuffle(fields)
+        cut = rng.randint(1, len(fields)) if fields else 0
+        records.append(" ".join(fields[:cut]) + "\n" + " ".join(fields[cut:]))
+    return records
+
+
+def legacy_is_valid(passw):
+    """ The original passport_checker2.py checks: substring presence test, then index() and fixed slices per field. """
+
+    if not all(part in passw for part in required):
+        return False
+    try:
+        iyr = int(passw[passw.index("iyr")+4: passw.index("iyr")+9])
+        valid = iyr <= 2025 and iyr >= 2015
+        eyr = int(passw[passw.index("eyr")+4: passw.index("eyr")+9])
+        valid = eyr <= 2035 and eyr >= 2025 and valid
+        m = re.search(r"\d+(in|cm)", passw[passw.index("hgt")+4:])
+        hgt = int(m.group(0)[:-2]) if m else -1
+        valid = ((hgt>=59 and hgt <=76) or (hgt >=150 and hgt <= 193)) and valid
+        hcl = passw[passw.index("hcl")+4: passw.index("hcl")+11]
+        valid = re.match(r"^#[0-9,a-f]{6}$", hcl) and valid
+        ecl = passw[passw.index("ecl")+4: passw.index("ecl")+7]
+        valid = ecl in eyes and valid
+        pid = passw[passw.index("pid")+4: passw.index("pid")+13]
+        m = re.search(r"(\d{9})\b", pid)
+        valid = bool(m) and valid
+        cid = int(passw[passw.index("cid")+4: passw.index("cid")+8])
+        valid = cid > 99 and cid < 1000 and valid
+    except ValueError:
+        return False
+    return bool(valid)
+
+
+validator = compile_rules(passport_rules)
+
+
+def tokenized_is_valid(passw):
+    """ The single-pass parser: one tokenize, then the compiled rules. """
+
+    fields = parse_record(passw)
+    return has_required_fields(fields) and validator(fields)
+
+
+def records_per_second(check, records):
+    start = time.perf_counter()
+    count = sum(1 for passw in records if check(passw))
+    return len(records) / (time.perf_counter() - start), count
+
+
+def write_synthetic_file(file, size_bytes, seed=0):
+    """ Writes synthetic passport records to file until it holds at least size_bytes. """
+
+    batch_seed = seed
+    written = 0
+    with open(file, "w", buffering=BUFFER_SIZE) as out:
+        while written < size_bytes:
+            text = "\n\n".join(synthetic_records(50_000, batch_seed)) + "\n\n"
+            out.write(text)
+            written += len(text)
+            batch_seed += 1
+
+
+def parallel_scaling(file):
+    """ Times validate_parallel on file for 1, 2, 4, ... workers up to the number of cores. """
+
+    size_mb = os.path.getsize(file) / (1 << 20)
+    workers = 1
+    while True:
+        start = time.perf_counter()
+        with open(os.devnull, "w") as out:
+            count, _ = validate_parallel(file, out, passport_rules, workers=workers)
+        elapsed = time.perf_counter() - start
+        print(f"{workers:>3} workers: {size_mb / elapsed:,.1f} MB/sec ({count} valid)")
+        if workers >= multiprocessing.cpu_count():
+            break
+        workers = min(workers * 2, multiprocessing.cpu_count())
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        if not os.path.exists(sys.argv[1]):
+            gigabytes = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+            write_synthetic_file(sys.argv[1], int(gigabytes * (1 << 30)))
+        parallel_scaling(sys.argv[1])
+    else:
+        records = synthetic_records(200_000)
+        for name, check in [("index/slice", legacy_is_valid), ("tokenized", tokenized_is_valid)]:
+            rate, count = records_per_second(check, records)
+            print(f"{name:>12}: {rate:,.0f} records/sec ({count} valid)")
+        parsed = [fields for fields in map(parse_record, records) if has_required_fields(fields)]
+        rate, count = records_per_second(validator, parsed)
+        print(f"{'validator':>12}: {rate:,.0f} records/sec ({count} valid of {len(parsed)} with every field)")
@@ -13,23 +13,23 @@
 # Date: 5 November 2025
 
 
+from passport_tools import read_records, write_records, filter_passports, BUFFER_SIZE
+from passport_export import ColumnWriter
+
 file = input("Enter the name of the file: ")
+folder = input("Enter a folder to export columns to (blank to skip): ")
+columns = ColumnWriter(folder) if folder else None
+
+# records are streamed one at a time, so the batch never has to fit in memory;
+# the fields parsed for validation go straight to the column export
+with open("valid_passports.txt", "w", buffering=BUFFER_SIZE) as r:
+    count = write_records(filter_passports(read_records(file), on_valid=columns.add if columns else None), r)
+
+print(f"There are {count} valid passports")
 
-f = open(file, "r+")
-r = open("valid_passports.txt", "w")
-required = ["iyr", "eyr", "hgt", "hcl", "ecl", "pid", "cid"]
-passlist = f.read().split("\n\n")
-valid = []
-
-for passw in passlist: 
-    if all(field in passw for field in required):
-        r.write(f"{passw}\n\n")
-        valid.append(passw)
-
-print(f"There are {len(valid)} valid passports")
-#r.write("\n\n".join([line for line in f.read().split("\n\n") if all(part in line for part in ["iyr", "eyr", "hgt", "hcl", "ecl", "pid", "cid"])]))
-f.close()
-r.close()
+if columns:
+    columns.close()
+    print(f"Exported columns to {folder}")
 
 
 
@@ -0,0 +1,128 @@
+# Columnar export of validated passports: every field is saved as its own .npy column, one file per batch,
+# so analytic queries only load the columns they need
+import os
+
+import numpy as np
+
+from passport_tools import parse_record
+
+# NumPy type of each exported column; numbers that are missing or malformed are stored as -1.
+# String widths are the usual value lengths: a batch with a longer value gets a wider column, never a cut-off value
+column_types = {
+    "byr": "i4",
+    "iyr": "i4",
+    "eyr": "i4",
+    "hgt": "U6",
+    "hcl": "U7",
+    "ecl": "U3",
+    "pid": "U9",
+    "cid": "i4",
+}
+
+BATCH_SIZE = 100_000
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return -1
+
+
+def build_columns(batch):
+    """ Parameters: batch (list of dict, parsed records).
+        Return: columns (dict, field -> NumPy array with one row per record) """
+
+    columns = {}
+    for field, dtype in column_types.items():
+        values = [fields.get(field) for fields in batch]
+        if dtype.startswith("i"):
+            columns[field] = np.array([_to_int(value) for value in values], dtype=dtype)
+        else:
+            strings = [value or "" for value in values]
+            width = max([int(dtype[1:])] + [len(value) for value in strings])
+            columns[field] = np.array(strings, dtype=f"U{width}")
+    return columns
+
+
+class ColumnWriter:
+    """ Writes parsed records to directory/<field>/part-NNNNN.npy as they arrive, batch_size rows per part file,
+        so a validation pass can export the fields it already parsed. Close it (or use it in a with block)
+        to write the last, partial batch. """
+
+    build_columns = staticmethod(build_columns)  # for worker processes that hand back ready-made batches
+
+    def __init__(self, directory, batch_size=BATCH_SIZE):
+        for field in column_types:  # start each column folder empty so old parts don't mix in
+            folder = os.path.join(directory, field)
+            os.makedirs(folder, exist_ok=True)
+            for name in os.listdir(folder):
+                if name.startswith("part-") and name.endswith(".npy"):
+                    os.remove(os.path.join(folder, name))
+        self.directory = directory
+        self.batch_size = batch_size
+        self.count = 0  # records written so far
+        self._part = 0
+        self._batch = []
+
+    def add(self, fields):
+        """ Queues one parsed record (dict), writing a part file once batch_size of them are waiting. """
+
+        self._batch.append(fields)
+        if len(self._batch) == self.batch_size:
+            self.flush()
+
+    def add_columns(self, columns):
+        """ Writes a batch already built by build_columns (dict, field -> array) as a part file of its own. """
+
+        self.flush()
+        self._save(columns)
+
+    def flush(self):
+        if self._batch:
+            self._save(build_columns(self._batch))
+            self._batch = []
+
+    def _save(self, columns):
+        rows = len(next(iter(columns.values())))
+        if not rows:
+            return
+        for field, column in columns.items():
+            np.save(os.path.join(self.directory, field, f"part-{self._part:05d}.npy"), column)
+        self._part += 1
+        self.count += rows
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def export_columns(records, directory, batch_size=BATCH_SIZE):
+    """ Parameters: records (iterable of str, passport records), directory (str, output folder),
+        batch_size (int, records per column file).
+        Parses the records and writes them to directory/<field>/part-NNNNN.npy, batch_size rows at a time.
+        Use a ColumnWriter instead to export records that were already parsed.
+        Return: count (int, number of records exported) """
+
+    with ColumnWriter(directory, batch_size) as writer:
+        for passw in records:
+            writer.add(parse_record(passw))
+    return writer.count
+
+
+def load_columns(directory, fields):
+    """ Parameters: directory (str, folder written by export_columns), fields (list of str, columns to read).
+        Reads only the requested columns, memory-mapping each part file.
+        Return: columns (dict, field -> NumPy array of every exported row) """
+
+    columns = {}
+    for field in fields:
+        folder = os.path.join(directory, field)
+        parts = [np.load(os.path.join(folder, name), mmap_mode="r") for name in sorted(os.listdir(folder))]
+        columns[field] = np.concatenate(parts) if parts else np.empty(0, dtype=column_types[field])
+    return columns
@@ -0,0 +1,250 @@
+# Shared helpers for the passport checkers: streams passport records from huge batch files with bounded memory
+from collections import Counter
+import os
+import re
+
+from batch_tools import map_file, map_chunks
+
+required = ["iyr", "eyr", "hgt", "hcl", "ecl", "pid", "cid"]
+eyes = ["amb", "blu", "brn", "gry", "grn", "hzl", "oth"]
+
+# Lab 11.9 value rules. Each field can have:
+#   "pattern": regex the whole value must match; if it has a group, group 1 is the number used by "range"
+#   "range":   list of (low, high) inclusive ranges the number must fall in
+#   "one_of":  allowed values (on its own, not with "pattern" or "range")
+passport_rules = {
+    "iyr": {"range": [(2015, 2025)]},
+    "eyr": {"range": [(2025, 2035)]},
+    "hgt": {"pattern": r"(\d+)(?:in|cm)", "range": [(59, 76), (150, 193)]},
+    "hcl": {"pattern": r"#[0-9,a-f]{6}"},
+    "ecl": {"one_of": eyes},
+    "pid": {"pattern": r"\d{9}"},
+    "cid": {"range": [(100, 999)]},
+}
+
+BUFFER_SIZE = 1 << 20  # 1 MiB read/write buffers
+CHUNK_SIZE = 32 << 20  # 32 MiB of the input per worker task in parallel mode
+
+
+def iter_records(lines):
+    """ Parameters: lines (iterable of str, lines of a passport file).
+        Groups lines into records separated by blank lines, holding only one record at a time.
+        Return: generator of records (str, lines joined by "\\n") """
+
+    record = []
+    for line in lines:
+        if line.strip():
+            record.append(line.rstrip("\r\n"))
+        elif record:
+            yield "\n".join(record)
+            record = []
+    if record:
+        yield "\n".join(record)
+
+
+def _mmap_lines(file):
+    """ Yields the decoded lines of file through a read-only memory map. """
+
+    with map_file(file) as mm:
+        for line in iter(mm.readline, b""):
+            yield line.decode()
+
+
+def read_records(file, use_mmap=False):
+    """ Parameters: file (str, name of the passport file), use_mmap (bool, read through mmap instead of a buffered file).
+        Return: generator of records (str), one blank-line-separated passport at a time """
+
+    if use_mmap:
+        yield from iter_records(_mmap_lines(file))
+    else:
+        with open(file, "r", buffering=BUFFER_SIZE) as f:
+            yield from iter_records(f)
+
+
+def write_records(records, out):
+    """ Parameters: records (iterable of str), out (writable text file).
+        Writes each record followed by a blank line as it arrives.
+        Return: count (int, number of records written) """
+
+    count = 0
+    for passw in records:
+        out.write(f"{passw}\n\n")
+        count += 1
+    return count
+
+
+# one pass over the record pulls out every key:value pair
+_FIELD = re.compile(r"(\w+):(\S*)")
+
+
+def parse_record(passw):
+    """ Parameters: passw (str, one passport record).
+        Splits the record into its fields in a single pass.
+        Return: fields (dict, field name -> value string) """
+
+    return dict(_FIELD.findall(passw))
+
+
+def has_required_fields(fields, names=required):
+    """ Return: True if every name is a field of the parsed record (dict) """
+
+    return all(name in fields for name in names)
+
+
+def _range_test(number, ranges):
+    """ Return: source of a test that number (source of an int expression, evaluated once) falls in one of the
+        inclusive (low, high) ranges, written as plain comparisons """
+
+    (low, high), rest = ranges[0], ranges[1:]
+    tests = [f"{int(low)} <= (n := {number}) <= {int(high)}"] + [f"{int(low)} <= n <= {int(high)}" for low, high in rest]
+    return " or ".join(tests)
+
+
+def _compile_rule(field, rule, constants):
+    """ Parameters: field (str), rule (dict, the field's entry in a rule spec),
+        constants (dict, names the generated code can use; compiled patterns and value sets are added to it).
+        Raises ValueError for unknown keys, an empty rule, an empty or malformed range and "one_of" mixed with
+        other keys, so a typo can't silently reject every record.
+        Return: (cost, test) where test is the source of an expression that is true when the field's value passes
+        (it may raise KeyError or ValueError), and cost ranks how expensive the test is """
+
+    unknown = set(rule) - {"pattern", "range", "one_of"}
+    if unknown:
+        raise ValueError(f"Rule for {field!r} has unknown keys: {', '.join(sorted(unknown))}")
+    if not rule:
+        raise ValueError(f"Rule for {field!r} is empty")
+    if "one_of" in rule and len(rule) > 1:
+        raise ValueError(f"Rule for {field!r} can't combine \"one_of\" with \"pattern\" or \"range\"")
+    ranges = tuple(rule.get("range", ()))
+    if "range" in rule and (not ranges or any(len(pair) != 2 or pair[0] > pair[1] for pair in ranges)):
+        raise ValueError(f"Rule for {field!r} needs \"range\" as a list of (low, high) pairs with low <= high")
+
+    value = f"fields[{field!r}]"
+    name = f"rule_{len(constants)}"
+    if "one_of" in rule:
+        constants[name] = frozenset(rule["one_of"])
+        return 0, f"{value} in {name}"
+    if "pattern" not in rule:
+        return 1, _range_test(f"int({value})", ranges)
+
+    pattern = re.compile(rule["pattern"])
+    constants[name] = pattern
+    if not ranges:
+        return 2, f"{name}.fullmatch({value}) is not None"
+    group = 1 if pattern.groups else 0
+    return 3, f"(m := {name}.fullmatch({value})) is not None and ({_range_test(f'int(m.group({group}))', ranges)})"
+
+
+def compile_rules(spec=passport_rules):
+    """ Parameters: spec (dict, field name -> rule).
+        Compiles the spec once into a single straight-line Python function: call it with a parsed record (dict) and it
+        returns True if every rule passes. Checks run cheapest first and stop at the first failure; a missing field or
+        a malformed number fails the rule being checked, under one try per record.
+        Return: the validator (function); its rejections (dict, rule -> records it stopped, starting at 0 for every
+                rule and for "missing fields") and checks (list of str, the fields in the order they are checked) """
+
+    constants = {}
+    compiled = [(cost, field, test) for field, (cost, test) in
+                ((field, _compile_rule(field, rule, constants)) for field, rule in spec.items())]
+    compiled.sort(key=lambda item: item[0])  # stable, so equal-cost rules keep the spec's order
+
+    source = ["def validate(fields, rejections=rejections):", "    field = None", "    try:"]
+    for _, field, test in compiled:
+        source += [f"        field = {field!r}",
+                   f"        if not ({test}):",
+                   f"            rejections[{field!r}] += 1",
+                   "            return False"]
+    source += ["    except (KeyError, ValueError):",  # a malformed number shouldn't stop a whole batch
+               "        rejections[field] += 1",
+               "        return False",
+               "    return True"]
+    checks = [field for _, field, _ in compiled]
+    # a plain dict with every key present: its item updates are quicker than a Counter's in the hot loop
+    rejections = dict.fromkeys(checks + ["missing fields"], 0)
+    namespace = dict(constants, rejections=rejections)
+    exec(compile("\n".join(source), "<passport rules>", "exec"), namespace)
+    validate = namespace["validate"]
+    validate.rejections = rejections
+    validate.checks = checks
+    return validate
+
+
+def filter_passports(records, validator=None, on_valid=None):
+    """ Parameters: records (iterable of str), validator (function from compile_rules, optional value rules),
+        on_valid (function, optional: called with the parsed fields of every valid record, e.g. ColumnWriter.add).
+        Parses each record once and keeps the ones with every required field that also pass the validator.
+        Records missing a field are counted in the validator's rejections as "missing fields".
+        Return: generator of the valid records (str) """
+
+    for passw in records:
+        fields = parse_record(passw)
+        if not has_required_fields(fields):
+            if validator is not None:
+                validator.rejections["missing fields"] += 1
+        elif validator is None or validator(fields):
+            if on_valid is not None:
+                on_valid(fields)
+            yield passw
+
+
+def chunk_boundaries(file, chunk_size=CHUNK_SIZE):
+    """ Parameters: file (str), chunk_size (int, approximate bytes per chunk).
+        Splits the file into byte ranges that each start right after a blank line, so no record is cut in two.
+        Return: list of (start, end) byte offsets covering the whole file """
+
+    size = os.path.getsize(file)
+    bounds = [0]
+    with open(file, "rb") as f:
+        pos = chunk_size
+        while pos < size:
+            f.seek(pos)
+            f.readline()  # skip the rest of the line we landed in
+            line = f.readline()
+            while line.strip():
+                line = f.readline()
+            pos = f.tell()
+            if pos >= size:
+                break
+            bounds.append(pos)
+            pos += chunk_size
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _validate_chunk(task):
+    """ Worker for validate_parallel: validates one byte range and returns (valid records text, count, rejections,
+        columns of the valid records built by build_columns, or None when nothing is exported). """
+
+    file, start, end, spec, build_columns = task
+    with open(file, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start).decode()
+    validator = compile_rules(spec) if spec is not None else None
+    parsed = [] if build_columns is not None else None
+    valid = list(filter_passports(iter_records(data.splitlines(True)), validator,
+                                  parsed.append if parsed is not None else None))
+    columns = build_columns(parsed) if parsed is not None else None
+    return ("".join(f"{passw}\n\n" for passw in valid), len(valid), +Counter(validator.rejections if validator else {}),
+            columns)
+
+
+def validate_parallel(file, out, spec=None, workers=None, chunk_size=CHUNK_SIZE, columns=None):
+    """ Parameters: file (str), out (writable text file), spec (dict, value rules to apply; None checks presence only),
+        workers (int, processes to use; defaults to the number of cores), chunk_size (int, bytes per task),
+        columns (passport_export.ColumnWriter, optional: also exports the fields of every valid record).
+        Validates record-aligned chunks of the file with batch_tools.map_chunks and writes the valid records in their
+        original order. Workers build the column batches from the fields they parsed, so exporting needs no
+        second read of the output.
+        Return: count (int, number of valid records), rejections (Counter, rule -> records it rejected) """
+
+    build_columns = columns.build_columns if columns is not None else None
+    chunks = [(file, start, end, spec, build_columns) for start, end in chunk_boundaries(file, chunk_size)]
+    count = 0
+    rejections = Counter()
+    for text, n, rejected, batch in map_chunks(_validate_chunk, chunks, workers):
+        out.write(text)
+        count += n
+        rejections.update(rejected)
+        if batch is not None:
+            columns.add_columns(batch)
+    return count, rejections
@@ -0,0 +1,74 @@
+"""
+Trouble Game - Headless Simulation Benchmark
+Plays random games through GameState without opening a window and reports throughput
+"""
+
+import os
+import random
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from fun_game import GameState
+
+
+class RescanGameState(GameState):
+    """GameState that counts finished pegs by rescanning every peg (the old behaviour)"""
+
+    def check_win_condition(self):
+        for player in self.players:
+            if len([peg for peg in player.pegs if peg.position >= 100]) == 4:
+                self.game_over = True
+                self.winner = player
+                self.message = f"{player.name} wins!"
+                return
+
+
+def play_game(game_state: GameState, num_players: int, max_rolls: int = 10000) -> int:
+    """Play one game with random peg choices, returning the number of moves made"""
+    game_state.initialize_game(num_players)
+    game_state.save_results = False
+    moves = 0
+    for _ in range(max_rolls):
+        roll = game_state.roll_dice()
+        valid_pegs = game_state.get_valid_pegs(roll)
+        if not valid_pegs:
+            game_state.advance_turn()
+            continue
+
+        move_result = game_state.move_peg(random.choice(valid_pegs), roll)
+        moves += 1
+        game_state.check_win_condition()
+        if game_state.game_over:
+            break
+
+        if game_state.should_grant_bonus_roll(move_result):
+            game_state.current_roll = None
+        else:
+            game_state.advance_turn()
+    return moves
+
+
+def run_benchmark(state_class, num_games: int, num_players: int, seed: int = 0) -> float:
+    """Play num_games games and return the moves per second achieved"""
+    random.seed(seed)
+    game_state = state_class()
+    total_moves = 0
+    start = time.perf_counter()
+    for _ in range(num_games):
+        total_moves += play_game(game_state, num_players)
+    elapsed = time.perf_counter() - start
+    return total_moves / elapsed
+
+
+def main():
+    num_games = 2000
+    for num_players in range(2, 5):
+        rescan = run_benchmark(RescanGameState, num_games, num_players)
+        counters = run_benchmark(GameState, num_games, num_players)
+        print(f"{num_players} players: rescan {rescan:,.0f} moves/s, "
+              f"counters {counters:,.0f} moves/s ({counters / rescan:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
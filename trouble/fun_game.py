@@ -10,6 +10,8 @@ import pygame.gfxdraw
 import math
 from typing import Tuple, List, Optional, Dict
 import datetime
+import weakref
+from functools import lru_cache
 
 
 class TroubleGame:
@@ -289,10 +291,10 @@ class TroubleGame:
 
             # Update message based on move result
             if move_result.get("entered_finish"):
-                self.game_state.message = f"{peg.owner.name} entered the finish zone!"
+                self.game_state.message = f"{self.game_state.owner_of(peg).name} entered the finish zone!"
             elif move_result.get("landed_on_double_trouble"):
                 self.game_state.message = (
-                    f"{peg.owner.name} landed on Double Trouble! Bonus roll!"
+                    f"{self.game_state.owner_of(peg).name} landed on Double Trouble! Bonus roll!"
                 )
 
             # Check win condition
@@ -305,8 +307,8 @@ class TroubleGame:
             # Check if bonus roll should be granted
             if self.game_state.should_grant_bonus_roll(move_result):
                 # Grant bonus roll
-                if self.game_state.current_roll == 6:
-                    self.game_state.message = f"Rolled a 6! Bonus roll!"
+                if self.game_state.bonus_on_roll[self.game_state.current_roll]:
+                    self.game_state.message = f"Rolled a {self.game_state.current_roll}! Bonus roll!"
                 # Reset for next roll
                 self.game_state.current_roll = None
             else:
@@ -377,7 +379,7 @@ class TroubleGame:
                 # Highlight valid pegs if waiting for selection
                 if self.waiting_for_peg_selection and self.game_state.current_roll is not None:
                     valid_pegs = self.game_state.get_valid_pegs(self.game_state.current_roll)
-                    self.renderer.highlight_pegs(valid_pegs)
+                    self.renderer.highlight_pegs(valid_pegs, self.game_state.players)
                 
                 # Render pause menu if paused
                 if self.paused:
@@ -397,20 +399,50 @@ Contains all game rules, state management, and business logic
 
 
 class Player:
-    def __init__(self, color: str, name: str):
+    """Represents a player and the pegs they own"""
+
+    __slots__ = ("color", "name", "index", "pegs", "pegs_home", "pegs_on_track", "pegs_finished")
+
+    def __init__(self, color: str, name: str, index: int = 0):
         self.color = color
         self.name = name
+        self.index = index  # seat in GameState.players
         self.pegs: List["Peg"] = []
+        # Running peg counts, set by GameState.initialize_game and kept up to date by GameState.move_peg
+        self.pegs_home = 0
+        self.pegs_on_track = 0
+        self.pegs_finished = 0
+
+    def _adjust_count(self, position: int, delta: int):
+        """Add delta to the counter for the zone that position falls in"""
+        if position == -1:
+            self.pegs_home += delta
+        elif position >= 100:
+            self.pegs_finished += delta
+        else:
+            self.pegs_on_track += delta
 
 class Peg:
-    """Represents a game piece"""
+    """Represents a game piece, identified by (player_index, peg_index)"""
 
-    def __init__(self, owner: Player):
-        self.owner = owner
+    __slots__ = ("player_index", "peg_index", "position", "_owner_of")
+
+    def __init__(self, owner: Player, peg_index: Optional[int] = None):
+        self.player_index = owner.index
+        self.peg_index = len(owner.pegs) if peg_index is None else peg_index
         self.position = -1  # -1 = home, 0-27 = track, 100+ = finish
+        self._owner_of = None  # weak GameState.owner_of, handed over by GameState.initialize_game
+
+    @property
+    def owner(self) -> Player:
+        """The owning player, looked up through its game (compatibility; game logic compares player_index instead)"""
+        owner_of = self._owner_of() if self._owner_of is not None else None
+        if owner_of is None:
+            raise AttributeError("peg.owner needs a peg from a live GameState.initialize_game")
+        return owner_of(self)
 
     def move_to(self, position: int):
-        """Move this peg to a new position"""
+        """Move this peg to a new position (GameState.move_peg also keeps the owner's peg counts in step)"""
         self.position = position
 
     def send_home(self):
@@ -418,6 +450,48 @@ class Peg:
         self.move_to(-1)
 
 
+class RuleVariant:
+    """House rules for a game of Trouble. Subclass and override attributes to make a variant.
+
+    GameState compiles the variant into lookup tables when the game is created, so none of
+    these attributes are consulted again on the per-move path.
+    """
+
+    name = "Classic"
+    exit_rolls = frozenset({1, 6})  # rolls that bring a peg out of home
+    track_rolls = frozenset({2, 3, 4, 5, 6})  # rolls that can move a peg already on the track
+    bonus_rolls = frozenset({6})  # rolls that earn another roll
+    double_trouble_spaces = frozenset({3, 10, 17, 24})  # landing here earns another roll
+    max_rolls_per_turn = 2
+    captures = True  # landing on an opponent sends it home; otherwise the space is blocked
+    exact_finish = True  # must land exactly in the finish zone; otherwise overshoot stops at the end
+
+
+class SixToExitRules(RuleVariant):
+    """Only a 6 brings a peg out of home, and a 1 moves pegs on the track"""
+
+    name = "Six to Exit"
+    exit_rolls = frozenset({6})
+    track_rolls = frozenset({1, 2, 3, 4, 5, 6})
+
+
+class FriendlyRules(RuleVariant):
+    """No captures: an occupied space can't be landed on"""
+
+    name = "Friendly"
+    captures = False
+
+
+class QuickFinishRules(RuleVariant):
+    """Overshooting the finish zone parks the peg on its last space"""
+
+    name = "Quick Finish"
+    exact_finish = False
+
+
+RULE_VARIANTS = {variant.name: variant for variant in (RuleVariant, SixToExitRules, FriendlyRules, QuickFinishRules)}
+
+
 class GameState:
     """Manages the complete game state and rules"""
 
@@ -427,7 +501,10 @@ class GameState:
     # Finish zone entry positions (where pegs leave the main track)
     FINISH_ENTRY_POSITIONS = {"RED": 27, "BLUE": 6, "GREEN": 13, "YELLOW": 20}
 
-    def __init__(self):
+    # Every position a peg can occupy: home, the 28 track spaces and the 4 finish spaces
+    ALL_POSITIONS = [-1] + list(range(28)) + list(range(100, 104))
+
+    def __init__(self, rules: Optional[RuleVariant] = None):
         self.players: List[Player] = []
         self.current_player_index = 0
         self.board_occupancy: Dict[int, Peg] = {}
@@ -436,6 +513,7 @@ class GameState:
         self.game_over = False
         self.winner: Optional[Player] = None
         self.message = ""
+        self.save_results = True  # headless simulations turn this off
         
         # Animation state
         self.is_rolling = False
@@ -447,10 +525,15 @@ class GameState:
         self.is_animating_move = False
         self.move_animation = None
 
-    def initialize_game(self, num_players: int):
+        self.rules = rules or RuleVariant()
+        self._compile_rules()
+
+    def initialize_game(self, num_players: int, rules: Optional[RuleVariant] = None):
         """Initialize a new game with the specified number of players"""
         if num_players < 2 or num_players > 4:
             raise ValueError("Number of players must be between 2 and 4")
+        if rules is not None:
+            self.rules = rules
 
         # Define player colors in order
         colors = ["RED", "BLUE", "GREEN", "YELLOW"]
@@ -458,12 +541,15 @@ class GameState:
 
         # Create players
         self.players = []
+        owner_of = weakref.WeakMethod(self.owner_of)  # shared by every peg; never keeps the game alive
         for i in range(num_players):
-            player = Player(colors[i], names[i])
-            # Create 4 pegs for each player
-            for _ in range(4):
-                peg = Peg(player)
+            player = Player(colors[i], names[i], i)
+            # Create 4 pegs for each player, all starting at home
+            for peg_index in range(4):
+                peg = Peg(player, peg_index)
+                peg._owner_of = owner_of
                 player.pegs.append(peg)
+            player.pegs_home = len(player.pegs)
             self.players.append(player)
 
         # Initialize game state
@@ -482,6 +568,30 @@ class GameState:
         self.is_animating_move = False
         self.move_animation = None
 
+        self._compile_rules()
+
+    def _compile_rules(self):
+        """Turn the rule variant into lookup tables used by the per-move code"""
+        rules = self.rules
+        self.exit_on_roll = tuple(roll in rules.exit_rolls for roll in range(7))
+        self.track_on_roll = tuple(roll in rules.track_rolls for roll in range(7))
+        self.bonus_on_roll = tuple(roll in rules.bonus_rolls for roll in range(7))
+        self.double_trouble_spaces = frozenset(rules.double_trouble_spaces)
+        self.max_rolls_per_turn = rules.max_rolls_per_turn
+
+        # move_table[player_index][position][roll] -> new position, or None if the move is impossible.
+        # Each player's table is shared by every game with the same color and movement rules
+        self.move_table = [
+            self._build_move_table(player.color, frozenset(rules.exit_rolls), rules.exact_finish)
+            for player in self.players
+        ]
+
+        # Bind the destination check for this capture rule once instead of testing it every move
+        if rules.captures:
+            self._is_valid_destination = self._is_valid_destination_capturing
+        else:
+            self._is_valid_destination = self._is_valid_destination_blocking
+
     def roll_dice(self) -> int:
         """Roll the dice and return the result"""
         self.current_roll = random.randint(1, 6)
@@ -492,88 +602,86 @@ class GameState:
         """Get all pegs that can be moved with the current roll"""
         current_player = self.get_current_player()
         valid_pegs = []
-        pegs_in_home = [peg for peg in current_player.pegs if peg.position == -1]
-        if roll == 1:
-            # Roll of 1: must move a peg from home to start
-            
-            start_pos = self.START_POSITIONS[current_player.color]
-
-            # Check if start position is blocked by own peg
-            if start_pos in self.board_occupancy:
-                occupying_peg = self.board_occupancy[start_pos]
-                if occupying_peg.owner == current_player:
-                    # Start is blocked by own peg, no valid moves
-                    return []
 
-            # Can move any peg from home
-            valid_pegs = pegs_in_home
-
-        elif roll == 6:
-            # Roll of 6: can move from home OR move a peg on track
+        if self.exit_on_roll[roll] and current_player.pegs_home:
+            # Exit roll: can move a peg from home to start, unless start is blocked by own peg
             start_pos = self.START_POSITIONS[current_player.color]
-
-            # Check if we can move from home
-            if pegs_in_home:
-                if (
-                    start_pos not in self.board_occupancy
-                    or self.board_occupancy[start_pos].owner != current_player
-                ):
-                    valid_pegs.extend(pegs_in_home)
-
-        # For rolls 2-6, check pegs on track
-        if roll >= 2:
-            pegs_on_track = [peg for peg in current_player.pegs if 0 <= peg.position < 100]
-            for peg in pegs_on_track:
-                new_pos = self._calculate_new_position(peg, roll)
-                if new_pos is not None and self._is_valid_destination(peg, new_pos):
-                    valid_pegs.append(peg)
+            if self._is_valid_destination(current_player.pegs[0], start_pos):
+                valid_pegs.extend(peg for peg in current_player.pegs if peg.position == -1)
+
+        # Check pegs on track
+        if self.track_on_roll[roll] and current_player.pegs_on_track:
+            moves = self.move_table[current_player.index]
+            for peg in current_player.pegs:
+                if 0 <= peg.position < 100:
+                    new_pos = moves[peg.position][roll]
+                    if new_pos is not None and self._is_valid_destination(peg, new_pos):
+                        valid_pegs.append(peg)
 
         return valid_pegs
 
     def _calculate_new_position(self, peg: Peg, roll: int) -> Optional[int]:
         """Calculate the new position for a peg after a roll"""
-        current_player = peg.owner
-
-        # If peg is in home and roll is 1 or 6, move to start
-        if peg.position == -1:
-            if roll == 1 or roll == 6:
-                return self.START_POSITIONS[current_player.color]
+        return self.move_table[peg.player_index][peg.position][roll]
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _build_move_table(color: str, exit_rolls: frozenset, exact_finish: bool) -> Dict[int, Tuple[Optional[int], ...]]:
+        """Build (once per color and movement rules) the position -> per-roll destination table; treat it as read-only"""
+        return {position: tuple(GameState._compute_new_position(color, position, roll, exit_rolls, exact_finish)
+                                for roll in range(7))
+                for position in GameState.ALL_POSITIONS}
+
+    @staticmethod
+    def _compute_new_position(color: str, position: int, roll: int,
+                              exit_rolls: frozenset, exact_finish: bool) -> Optional[int]:
+        """Work out where a peg of the given color ends up under the given rules (used to build move_table)"""
+        last_finish_index = 3
+
+        # If peg is in home and roll is an exit roll, move to start
+        if position == -1:
+            if roll in exit_rolls:
+                return GameState.START_POSITIONS[color]
             return None
 
         # If peg is in finish zone, try to advance within finish
-        if peg.position >= 100:
-            finish_index = peg.position - 100
+        if position >= 100:
+            finish_index = position - 100
             new_finish_index = finish_index + roll
-            if new_finish_index < 4:
+            if new_finish_index <= last_finish_index:
                 return 100 + new_finish_index
-            # Can't move past the end of finish zone
+            # Past the end of finish zone: stop on the last space if allowed
+            if not exact_finish and finish_index < last_finish_index:
+                return 100 + last_finish_index
             return None
 
         # Calculate new position on track
-        new_pos = peg.position + roll
+        new_pos = position + roll
 
         # Check if peg should enter finish zone
-        finish_entry = self.FINISH_ENTRY_POSITIONS[current_player.color]
-        start_pos = self.START_POSITIONS[current_player.color]
+        finish_entry = GameState.FINISH_ENTRY_POSITIONS[color]
+        start_pos = GameState.START_POSITIONS[color]
 
+        steps_into_finish = None
         # Check if we cross the finish entry point
         # Need to handle wrap-around: track goes 0-27
-        if peg.position <= finish_entry < new_pos:
+        if position <= finish_entry < new_pos:
             # We crossed the finish entry going forward
             steps_into_finish = new_pos - finish_entry - 1
-            if steps_into_finish < 4:
-                return 100 + steps_into_finish
-            # Overshot finish zone
-            return None
-        elif peg.position > finish_entry and new_pos >= 28:
+        elif position > finish_entry and new_pos >= 28:
             # We wrapped around - check if we would cross finish entry after wrap
             steps_after_wrap = new_pos - 28
             if start_pos <= finish_entry < start_pos + steps_after_wrap:
                 # We crossed finish entry after wrapping
                 steps_into_finish = start_pos + steps_after_wrap - finish_entry - 1
-                if steps_into_finish < 4:
-                    return 100 + steps_into_finish
-                return None
+
+        if steps_into_finish is not None:
+            if steps_into_finish <= last_finish_index:
+                return 100 + steps_into_finish
+            # Overshot finish zone
+            if not exact_finish:
+                return 100 + last_finish_index
+            return None
 
         # Normal track movement (wrap around at 28)
         return new_pos % 28
@@ -582,13 +690,13 @@ class GameState:
         """Calculate the full path of positions for a move"""
         path = [peg.position]
         current_pos = peg.position
-        current_player = peg.owner
+        current_player = self.players[peg.player_index]
+        destination = self._calculate_new_position(peg, roll)
         
         # Handle move from home
         if peg.position == -1:
-            if roll == 1 or roll == 6:
-                start_pos = self.START_POSITIONS[current_player.color]
-                path.append(start_pos)
+            if destination is not None:
+                path.append(destination)
             return path
             
         # Handle move from finish (shouldn't happen usually)
@@ -599,7 +707,7 @@ class GameState:
         steps_remaining = roll
         finish_entry = self.FINISH_ENTRY_POSITIONS[current_player.color]
         
-        while steps_remaining > 0:
+        while steps_remaining > 0 and current_pos != destination:
             if current_pos == finish_entry:
                 # Enter finish zone
                 next_pos = 100
@@ -616,15 +724,20 @@ class GameState:
                 
         return path
 
-    def _is_valid_destination(self, peg: Peg, new_pos: int) -> bool:
-        """Check if a destination position is valid for a peg"""
+    def _is_valid_destination_capturing(self, peg: Peg, new_pos: int) -> bool:
+        """Check if a destination position is valid for a peg when captures are allowed"""
         # Check if destination is occupied by own peg
         if new_pos in self.board_occupancy:
             occupying_peg = self.board_occupancy[new_pos]
-            if occupying_peg.owner == peg.owner:
+            if occupying_peg.player_index == peg.player_index:
                 return False
         return True
 
+    def _is_valid_destination_blocking(self, peg: Peg, new_pos: int) -> bool:
+        """Check if a destination position is valid for a peg when captures are not allowed"""
+        # Any occupied track space blocks the move
+        return new_pos not in self.board_occupancy
+
     def move_peg(self, peg: Peg, roll: int) -> dict:
         """Move a peg and return the result of the move"""
         result = {
@@ -648,15 +761,22 @@ class GameState:
         # Check for capture before moving (only on track positions)
         if new_pos >= 0 and new_pos < 100:
             captured_peg = self.check_capture(new_pos)
-            if captured_peg and captured_peg.owner != peg.owner:
+            if captured_peg and captured_peg.player_index != peg.player_index:
                 # Send opponent peg home
+                captured_owner = self.players[captured_peg.player_index]
+                captured_owner._adjust_count(captured_peg.position, -1)
+                captured_owner._adjust_count(-1, 1)
                 captured_peg.send_home()
                 result["captured"] = captured_peg
                 self.message = (
-                    f"{peg.owner.name} captured {captured_peg.owner.name}'s peg!"
+                    f"{self.players[peg.player_index].name} captured "
+                    f"{self.players[captured_peg.player_index].name}'s peg!"
                 )
 
         # Move the peg
+        owner = self.players[peg.player_index]
+        owner._adjust_count(peg.position, -1)
+        owner._adjust_count(new_pos, 1)
         peg.move_to(new_pos)
 
         # Update board occupancy for new position
@@ -680,17 +800,16 @@ class GameState:
 
     def is_double_trouble(self, position: int) -> bool:
         """Check if the given position is a double trouble space"""
-        # Double trouble spaces are at positions 3, 10, 17, 24
-        return position in [3, 10, 17, 24]
+        return position in self.double_trouble_spaces
 
     def should_grant_bonus_roll(self, move_result: dict) -> bool:
         """Determine if a bonus roll should be granted"""
-        # Maximum 2 rolls per turn
-        if self.rolls_this_turn >= 2:
+        # Maximum rolls per turn
+        if self.rolls_this_turn >= self.max_rolls_per_turn:
             return False
 
-        # Grant bonus roll if rolled a 6
-        if self.current_roll == 6:
+        # Grant bonus roll if rolled a bonus roll (a 6 in the classic rules)
+        if self.bonus_on_roll[self.current_roll]:
             return True
 
         # Grant bonus roll if landed on double trouble space
@@ -715,13 +834,18 @@ class GameState:
     def check_win_condition(self):
         """Check if any player has won the game"""
         for player in self.players:
-            if len([peg for peg in player.pegs if peg.position >= 100]) == 4:
+            if player.pegs_finished == 4:
                 self.game_over = True
                 self.winner = player
                 self.message = f"{player.name} wins!"
-                self.save_game_results()
+                if self.save_results:
+                    self.save_game_results()
                 return
 
+    def owner_of(self, peg: Peg) -> Player:
+        """Get the player who owns a peg"""
+        return self.players[peg.player_index]
+
     def get_current_player(self) -> Player:
         """Get the current player"""
         if self.players:
@@ -737,8 +861,7 @@ class GameState:
             # Calculate player rankings based on pegs in finish zone
             rankings = []
             for player in self.players:
-                pegs_finished = len([peg for peg in player.pegs if peg.position >= 100])
-                rankings.append((player.color, pegs_finished))
+                rankings.append((player.color, player.pegs_finished))
             
             # Sort by pegs finished (descending)
             rankings.sort(key=lambda x: x[1], reverse=True)
@@ -809,7 +932,7 @@ class GameRenderer:
             self.render_game_over_screen(game_state.winner, mouse_pos)
         else:
             self.render_board()
-            self.render_track_spaces()
+            self.render_track_spaces(game_state.double_trouble_spaces)
             self.render_home_bases(game_state.players)
             self.render_finish_zones(game_state.players)
             self.render_pegs_with_animation(game_state)
@@ -897,10 +1020,8 @@ class GameRenderer:
             draw_pip(-d, 0)
             draw_pip(d, 0)
 
-    def render_track_spaces(self):
+    def render_track_spaces(self, double_trouble_positions=frozenset({3, 10, 17, 24})):
         # Render the playing track spaces
-        # Double trouble spaces
-        double_trouble_positions = [3, 10, 17, 24]
         for position, (x, y) in self.space_positions.items():
             # Determine color based on whether it's a double trouble space
             if position in double_trouble_positions:
@@ -960,22 +1081,24 @@ class GameRenderer:
                     self._draw_circle_antialiased(self.screen, COLORS[player.color], (x, y), 12)
                     pygame.gfxdraw.aacircle(self.screen, int(x), int(y), 12, COLORS["WHITE"])
 
-    def get_peg_screen_position(self, peg: Peg) -> Tuple[int, int]:
-        # Get the screen coordinates for a peg
+    def get_peg_screen_position(self, peg: Peg, players: List[Player]) -> Tuple[int, int]:
+        # Get the screen coordinates for a peg of one of the players
         home_positions = {"RED": (150, 150), "BLUE": (1050, 150), "GREEN": (1050, 750), "YELLOW": (150, 750)}
         
         if peg.position == -1:
             # Position in home base (2x2 grid)
-            base_x, base_y = home_positions[peg.owner.color]
-            pegs_in_home = [p for p in peg.owner.pegs if p.position == -1]
+            owner = players[peg.player_index]
+            base_x, base_y = home_positions[owner.color]
+            pegs_in_home = [p for p in owner.pegs if p.position == -1]
             index = pegs_in_home.index(peg) if peg in pegs_in_home else 0
             x = base_x - 30 + (index % 2) * 60
             y = base_y - 30 + (index // 2) * 60
             return (x, y)
         elif peg.position >= 100:
             # Position in finish zone
-            start_x, start_y = finish_positions[peg.owner.color]
-            dx, dy = finish_directions[peg.owner.color]
+            owner = players[peg.player_index]
+            start_x, start_y = finish_positions[owner.color]
+            dx, dy = finish_directions[owner.color]
             finish_index = peg.position - 100
             x = start_x + dx * finish_index * 30
             y = start_y + dy * finish_index * 30
@@ -989,7 +1112,8 @@ class GameRenderer:
 
     def render_pegs_with_animation(self, game_state: GameState):
         # Render all pegs, handling animation
-        for player in game_state.players:
+        players = game_state.players
+        for player in players:
             for peg in player.pegs:
                 x, y = 0, 0
                 if game_state.is_animating_move and game_state.move_animation and game_state.move_animation['peg'] == peg:
@@ -1004,7 +1128,7 @@ class GameRenderer:
                     
                     if total_steps <= 0:
                         # Should not happen if path has at least start and end
-                        x, y = self.get_peg_screen_position(peg)
+                        x, y = self.get_peg_screen_position(peg, players)
                     else:
                         # Determine which step we are on
                         current_step_index = int(elapsed / step_duration)
@@ -1012,7 +1136,7 @@ class GameRenderer:
                         if current_step_index >= total_steps:
                             # Animation finished, stay at end
                             end_pos = path[-1]
-                            coord = self._get_coord_for_pos(peg, end_pos)
+                            coord = self._get_coord_for_pos(peg, end_pos, players)
                             x, y = coord
                         else:
                             # Interpolate between current step and next step
@@ -1021,14 +1145,14 @@ class GameRenderer:
                             start_pos = path[current_step_index]
                             end_pos = path[current_step_index + 1]
                             
-                            start_coord = self._get_coord_for_pos(peg, start_pos)
-                            end_coord = self._get_coord_for_pos(peg, end_pos)
+                            start_coord = self._get_coord_for_pos(peg, start_pos, players)
+                            end_coord = self._get_coord_for_pos(peg, end_pos, players)
                             
                             # Lerp
                             x = start_coord[0] + (end_coord[0] - start_coord[0]) * step_progress
                             y = start_coord[1] + (end_coord[1] - start_coord[1]) * step_progress
                 else:
-                    x, y = self.get_peg_screen_position(peg)
+                    x, y = self.get_peg_screen_position(peg, players)
                 # Cast to int for drawing
                 ix, iy = int(x), int(y)
 
@@ -1044,16 +1168,16 @@ class GameRenderer:
                 # Outline
                 pygame.gfxdraw.aacircle(self.screen, ix, iy, 12, (0, 0, 0))
 
-    def _get_coord_for_pos(self, peg: Peg, pos: int) -> Tuple[int, int]:
+    def _get_coord_for_pos(self, peg: Peg, pos: int, players: List[Player]) -> Tuple[int, int]:
         # Get screen coordinate for a logical position
         # Temporarily set peg position to get coordinate, then restore
         old_pos = peg.position
         
         peg.move_to(pos)
-        coord = self.get_peg_screen_position(peg)
+        coord = self.get_peg_screen_position(peg, players)
         
         # Restore
-        peg.position = old_pos
+        peg.move_to(old_pos)
         return coord
 
     def render_dice_button(self, enabled: bool, current_roll: Optional[int], mouse_pos: Tuple[int, int]):
@@ -1344,16 +1468,16 @@ class GameRenderer:
         back_text_rect = back_text.get_rect(center=(600, 780 + offset_y))
         self.screen.blit(back_text, back_text_rect)
 
-    def highlight_pegs(self, pegs: List[Peg]):
-        # Highlight valid pegs for selection
+    def highlight_pegs(self, pegs: List[Peg], players: List[Player]):
+        # Highlight valid pegs of the players for selection
         for peg in pegs:
-            x, y = self.get_peg_screen_position(peg)
+            x, y = self.get_peg_screen_position(peg, players)
 
             # Draw pulsating highlight (could animate radius based on time if we had it)
             self._draw_circle_antialiased(self.screen, COLORS["HIGHLIGHT"], (x, y), 20)
             
             # Redraw peg on top
-            self._draw_circle_antialiased(self.screen, COLORS[peg.owner.color], (x, y), 12)
+            self._draw_circle_antialiased(self.screen, COLORS[players[peg.player_index].color], (x, y), 12)
             pygame.gfxdraw.aacircle(self.screen, x, y, 12, (0, 0, 0))
 
     def get_clicked_peg(self, mouse_pos: Tuple[int, int], players: List[Player]) -> Optional[Peg]:
@@ -1362,7 +1486,7 @@ class GameRenderer:
         # Check all pegs for all players
         for player in players:
             for peg in player.pegs:
-                peg_x, peg_y = self.get_peg_screen_position(peg)
+                peg_x, peg_y = self.get_peg_screen_position(peg, players)
                 # Calculate distance from mouse to peg center
                 distance = ((mouse_x - peg_x) ** 2 + (mouse_y - peg_y) ** 2) ** 0.5
                 # If within peg radius (12 pixels + some tolerance)
@@ -11,6 +11,10 @@
 # Assignment: Lab 9.19
 # Date: 22 Ocotober 2025
 
+import sys
+
+from word_puzzle_tools import solve_puzzle, grade_parallel, CORRECT, WRONG, INVALID
+
 
 #Starter Code
 def print_puzzle(puzzle):
@@ -49,7 +53,7 @@ def is_valid_guess(b1, b2) -> bool:
                 count += 1
         if count > 1:
             break
-    x = all(i in b1 for i in b2) and len(set(i for i in b2)) == 10) and count == 1
+    x = all(i in b1 for i in b2) and len(set(i for i in b2)) == 10 and count == 1
     return x
 
 
@@ -84,5 +88,15 @@ def main():
     
 
 if __name__ == '__main__':
-    main()
+    if len(sys.argv) > 2: #grading mode: word_puzzle.py PUZZLE GUESSFILE (one guess per line)
+        with open(sys.argv[2]) as f:
+            results = grade_parallel(sys.argv[1], f.read().split())
+        for result in (CORRECT, WRONG, INVALID):
+            print(f"{result}: {results.count(result)}")
+    elif len(sys.argv) > 1: #solver mode: word_puzzle.py PUZZLE
+        print_puzzle(sys.argv[1])
+        print()
+        print(f"Solution: {solve_puzzle(sys.argv[1])}")
+    else:
+        main()
     #print(is_valid_guess("asdfghjklp", "plkjhgfdsa"))
@@ -0,0 +1,192 @@
+# Long-division word puzzles in the print_puzzle layout: parses the lines once and solves them by backtracking,
+# pinning letters down from every partial-product and difference line as soon as their digits are known.
+# Also grades batches of guesses against a parsed puzzle, optionally in a process pool
+from itertools import permutations
+
+from batch_tools import map_chunks
+
+CORRECT, WRONG, INVALID = "correct", "wrong", "invalid"
+CHUNK_SIZE = 50_000  # guesses per worker task when grading in parallel
+
+
+def _unify(word, value, assignment):
+    """ Parameters: word (str, letters), value (int), assignment (dict, letter -> digit).
+        Matches value's digits against word: assigned letters must agree and new letters take unused digits.
+        A length mismatch fails, so a word's leading letter can only be 0 when the word is one letter long.
+        Return: the extended assignment (dict), or None if value doesn't fit the word """
+
+    digits = str(value)
+    if value < 0 or len(digits) != len(word):
+        return None
+    new = dict(assignment)
+    used = set(new.values())
+    for letter, digit in zip(word, map(int, digits)):
+        if letter in new:
+            if new[letter] != digit:
+                return None
+        elif digit in used:
+            return None
+        else:
+            new[letter] = digit
+            used.add(digit)
+    return new
+
+
+def _value(word, assignment):
+    return int("".join(str(assignment[letter]) for letter in word))
+
+
+class DivisionPuzzle:
+    """ A puzzle such as "RUE,EAR | RUMORS,UEII  ,UKTR ,EAR ,KEOS,KAIK,USA": quotient, then divisor | dividend, then
+        a partial product and a difference line per quotient digit; the last difference is the remainder.
+        Trailing spaces give a line's place: a line with two of them ends under the dividend's hundreds digit. """
+
+    def __init__(self, puzzle):
+        lines = [line for line in puzzle.split(",") if line.strip()]
+        if len(lines) < 3 or "|" not in lines[1] or len(lines) % 2 != 0:
+            raise ValueError("Not a long division puzzle")
+
+        self.quotient = lines[0].strip()
+        divisor, dividend = lines[1].split("|")
+        self.divisor = divisor.strip()
+        self.dividend = dividend.strip()
+        self.remainder = lines[-1].strip()
+        # (product word, its place, difference word, its place) for every step of the division
+        self.steps = [(product.strip(), len(product) - len(product.rstrip()),
+                       difference.strip(), len(difference) - len(difference.rstrip()))
+                      for product, difference in zip(lines[2::2], lines[3::2])]
+        self.letters = sorted(set("".join(lines)) - set("| "))
+        self.letter_set = frozenset(self.letters)
+
+        self._products = {place: product for product, place, _, _ in self.steps}
+        if len(self._products) != len(self.steps) or any(place >= len(self.quotient) for place in self._products):
+            raise ValueError("Partial products must sit under different quotient digits")
+
+    def _quotient_digits(self, assignment, places):
+        """ Yields assignments where every quotient letter in places is set and its product line matches. """
+
+        if not places:
+            yield assignment
+            return
+        place, rest = places[0], places[1:]
+        letter = self.quotient[len(self.quotient) - 1 - place]
+        product = self._products.get(place)
+        if product is None:  # no step under this digit, so it is a 0
+            new = _unify(letter, 0, assignment)
+            if new is not None:
+                yield from self._quotient_digits(new, rest)
+            return
+
+        divisor = _value(self.divisor, assignment)
+        choices = [assignment[letter]] if letter in assignment else range(1, 10)
+        for q in choices:
+            new = _unify(letter, q, assignment)
+            if new is not None:
+                new = _unify(product, q * divisor, new)
+            if new is not None:
+                yield from self._quotient_digits(new, rest)
+
+    def solutions(self):
+        """ Yields every assignment (dict, letter -> digit) that makes the whole division work. """
+
+        # the divisor first: with it known, each quotient digit pins down a whole partial-product line
+        divisor_letters = list(dict.fromkeys(self.divisor))
+        for digits in permutations(range(10), len(divisor_letters)):
+            assignment = dict(zip(divisor_letters, digits))
+            if assignment[self.divisor[0]] == 0 and len(self.divisor) > 1:
+                continue
+            divisor = _value(self.divisor, assignment)
+            for partial in self._quotient_digits(assignment, sorted(range(len(self.quotient)), reverse=True)):
+                yield from self._remainders(partial, divisor)
+
+    def _remainders(self, assignment, divisor):
+        """ Tries the remainder's open letters (remainder < divisor), then checks the dividend and differences. """
+
+        quotient = _value(self.quotient, assignment)
+        open_letters = list(dict.fromkeys(letter for letter in self.remainder if letter not in assignment))
+        free = [digit for digit in range(10) if digit not in assignment.values()]
+        for digits in permutations(free, len(open_letters)):
+            full = dict(assignment, **dict(zip(open_letters, digits)))
+            remainder = _value(self.remainder, full)
+            if remainder >= divisor or (full[self.remainder[0]] == 0 and len(self.remainder) > 1):
+                continue
+            dividend = quotient * divisor + remainder
+            full = _unify(self.dividend, dividend, full)
+            # every difference line is what is left of the dividend, cut off at the line's place
+            left = dividend
+            for product, place, difference, difference_place in self.steps:
+                if full is None:
+                    break
+                left -= _value(product, full) * 10 ** place
+                full = _unify(difference, left // 10 ** difference_place, full)
+            if full is not None:
+                yield full
+
+    def solve(self):
+        """ Return: the first solution (dict, letter -> digit), or None if there is none """
+
+        return next(self.solutions(), None)
+
+    def guess(self, assignment):
+        """ Return: the guess string for an assignment (letter at index d stands for digit d); needs 10 letters """
+
+        if len(assignment) != 10:
+            raise ValueError("A guess needs a letter for every digit")
+        by_digit = {digit: letter for letter, digit in assignment.items()}
+        return "".join(by_digit[digit] for digit in range(10))
+
+
+def solve_puzzle(puzzle):
+    """ Parameters: puzzle (str, in the print_puzzle layout).
+        Return: the winning guess (str, e.g. "ABCDEFGHIJ"), or None if the puzzle has no solution """
+
+    parsed = DivisionPuzzle(puzzle)
+    solution = parsed.solve()
+    return parsed.guess(solution) if solution is not None else None
+
+
+def grade_guess(parsed, guess):
+    """ Parameters: parsed (DivisionPuzzle), guess (str, letter at index d stands for digit d).
+        Same checks as word_puzzle.py: a valid guess uses each of the puzzle's 10 letters once, and it is correct
+        when dividend == quotient * divisor + remainder. The letters become digits through one str.translate table.
+        Return: CORRECT, WRONG or INVALID """
+
+    if len(guess) != 10 or len(parsed.letters) != 10 or set(guess) != parsed.letter_set:
+        return INVALID
+    table = str.maketrans(guess, "0123456789")
+    dividend, quotient, divisor, remainder = (int(word.translate(table)) for word in
+                                              (parsed.dividend, parsed.quotient, parsed.divisor, parsed.remainder))
+    return CORRECT if dividend == quotient * divisor + remainder else WRONG
+
+
+def grade_guesses(puzzle, guesses):
+    """ Parameters: puzzle (str or DivisionPuzzle), guesses (iterable of str).
+        Return: list of CORRECT / WRONG / INVALID, one per guess """
+
+    parsed = puzzle if isinstance(puzzle, DivisionPuzzle) else DivisionPuzzle(puzzle)
+    return [grade_guess(parsed, guess.strip()) for guess in guesses]
+
+
+_worker_puzzle = None
+
+
+def _init_worker(puzzle):
+    global _worker_puzzle
+    _worker_puzzle = DivisionPuzzle(puzzle)  # parsed once per worker, reused for all its chunks
+
+
+def _grade_chunk(guesses):
+    return [grade_guess(_worker_puzzle, guess.strip()) for guess in guesses]
+
+
+def grade_parallel(puzzle, guesses, workers=None, chunk_size=CHUNK_SIZE):
+    """ Parameters: puzzle (str), guesses (list of str), workers (int, processes; defaults to the number of cores),
+        chunk_size (int, guesses per task).
+        Grades the guesses chunk by chunk with batch_tools.map_chunks, in order.
+        Return: list of CORRECT / WRONG / INVALID, one per guess """
+
+    chunks = [guesses[start:start + chunk_size] for start in range(0, len(guesses), chunk_size)]
+    results = []
+    for graded in map_chunks(_grade_chunk, chunks, workers, initializer=_init_worker, initargs=(puzzle,)):
+        results.extend(graded)
+    return results